@@ -0,0 +1,234 @@
+"""
+Grid-bucketed spatial index over campus coverage.
+
+Campuses are bucketed into fixed-size lat/lon cells. Queries visit occupied
+cells best-first, ordered by a lower bound on the distance to anything in
+the cell, and stop as soon as no unvisited cell can contain a closer
+campus. Empty cells are never probed, so the cost does not depend on how
+far the query point is from the data, and longitude wraps at +/-180.
+Distances use the haversine formula, which is within ~0.5% of geodesic
+and an order of magnitude cheaper.
+"""
+import bisect
+import heapq
+import itertools
+import math
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Cell size in degrees (~55 km of latitude)
+CELL_DEGREES = 0.5
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _valid_coordinates(lat: Any, lon: Any) -> bool:
+    return (isinstance(lat, (int, float)) and isinstance(lon, (int, float))
+            and -90 <= lat <= 90 and -180 <= lon <= 180)
+
+
+class CampusIndex:
+    """
+    Spatial index over a campus list.
+    Queries return (distance_km, position) pairs, position being the
+    campus's index in the list the index was built from.
+    """
+
+    def __init__(self, campus_coverage: List[Dict[str, Any]], cell_degrees: float = CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self._nrows = math.ceil(180 / cell_degrees)
+        self._ncols = math.ceil(360 / cell_degrees)
+        self._points: List[Tuple[float, float]] = []
+        self._positions: List[int] = []
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+
+        for position, campus in enumerate(campus_coverage):
+            if not isinstance(campus, dict):
+                continue
+            lat, lon = campus.get('latitude'), campus.get('longitude')
+            if not _valid_coordinates(lat, lon):
+                continue
+            slot = len(self._points)
+            self._points.append((lat, lon))
+            self._positions.append(position)
+            self._cells.setdefault(self._cell(lat, lon), []).append(slot)
+        self._index_rows()
+
+    def _index_rows(self) -> None:
+        # Occupied rows, and the occupied columns of each row, in order
+        self._rows: List[int] = sorted({row for row, _ in self._cells})
+        self._row_cols: Dict[int, List[int]] = {}
+        for row, col in self._cells:
+            self._row_cols.setdefault(row, []).append(col)
+        for cols in self._row_cols.values():
+            cols.sort()
+
+    def to_payload(self) -> Dict[str, Any]:
+        """JSON-serializable form of the index, for the compiled artifact."""
+        return {
+            'cell_degrees': self.cell_degrees,
+            'points': self._points,
+            'positions': self._positions,
+            'cells': [[row, col, slots] for (row, col), slots in self._cells.items()],
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> 'CampusIndex':
+        """Rebuild an index from to_payload() output without re-bucketing."""
+        index = cls([], payload['cell_degrees'])
+        index._points = [(lat, lon) for lat, lon in payload['points']]
+        index._positions = payload['positions']
+        index._cells = {(row, col): slots for row, col, slots in payload['cells']}
+        index._index_rows()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def sizeof(self) -> int:
+        """Approximate memory held by the index in bytes."""
+        size = sys.getsizeof(self._points) + sys.getsizeof(self._positions)
+        size += sum(sys.getsizeof(point) + sys.getsizeof(point[0]) + sys.getsizeof(point[1]) for point in self._points)
+        size += sum(sys.getsizeof(position) for position in self._positions)
+        size += sys.getsizeof(self._cells) + sys.getsizeof(self._rows) + sys.getsizeof(self._row_cols)
+        size += sum(sys.getsizeof(cell) + sys.getsizeof(slots) for cell, slots in self._cells.items())
+        size += sum(sys.getsizeof(cols) for cols in self._row_cols.values())
+        return size
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        row = min(self._nrows - 1, math.floor((lat + 90) / self.cell_degrees))
+        col = math.floor(((lon + 180) % 360) / self.cell_degrees) % self._ncols
+        return row, col
+
+    def _row_bounds(self, row: int, lat: float) -> Tuple[float, float]:
+        """
+        Lower bounds for everything in `row`: the haversine latitude term
+        sin^2(dlat / 2), and cos(latitude). The latitude term alone already
+        bounds the distance, right up to the poles.
+        """
+        south = row * self.cell_degrees - 90
+        north = min(90.0, south + self.cell_degrees)
+        dlat = max(0.0, south - lat, lat - north)
+        cos_min = max(0.0, min(math.cos(math.radians(south)), math.cos(math.radians(north))))
+        return math.sin(math.radians(dlat) / 2) ** 2, cos_min
+
+    def _cell_bound(self, col: int, lon: float, lat_term: float, cos_factor: float) -> float:
+        """
+        Lower bound km for a cell: haversine with each term replaced by its
+        smallest possible value over the cell.
+        """
+        center = (col + 0.5) * self.cell_degrees - 180
+        gap = max(0.0, abs((center - lon + 180) % 360 - 180) - self.cell_degrees / 2)
+        a = lat_term + cos_factor * math.sin(math.radians(gap) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+    def _walk(self, lat: float, lon: float) -> Iterator[Tuple[float, List[int]]]:
+        """
+        Yield (lower bound km, slots) for every occupied cell in increasing
+        order of bound.
+
+        Rows are opened outward from the query row. Each opened row gets two
+        column cursors walking away from the query column, one eastward and
+        one westward, which split the row at the antimeridian of the query
+        so no cell is visited twice. Bounds only grow along a cursor, so a
+        heap over the cursor heads yields cells best-first.
+        """
+        if not self._rows:
+            return
+        qrow, qcol = self._cell(lat, lon)
+        cos_q = math.cos(math.radians(lat))
+        half = self._ncols // 2
+        seq = itertools.count()
+        heap: list = []
+
+        def open_row(row_idx: int, step: int) -> None:
+            if 0 <= row_idx < len(self._rows):
+                lat_term, _ = self._row_bounds(self._rows[row_idx], lat)
+                bound = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(lat_term)))
+                heapq.heappush(heap, (bound, next(seq), row_idx, step, None))
+
+        def push_cell(row: int, cols: List[int], idx: int, direction: int, taken: int,
+                      lat_term: float, cos_factor: float) -> None:
+            if taken >= len(cols):
+                return
+            idx %= len(cols)
+            offset = ((cols[idx] - qcol) * direction) % self._ncols
+            # East takes offsets [0, half], west takes the rest
+            if (direction > 0 and offset > half) or (direction < 0 and (offset == 0 or offset >= self._ncols - half)):
+                return
+            bound = self._cell_bound(cols[idx], lon, lat_term, cos_factor)
+            heapq.heappush(heap, (bound, next(seq), row, direction, (cols, idx, taken, lat_term, cos_factor)))
+
+        start = bisect.bisect_left(self._rows, qrow)
+        open_row(start, 1)
+        open_row(start - 1, -1)
+
+        while heap:
+            bound, _, a, b, cursor = heapq.heappop(heap)
+            if cursor is None:
+                # Row event: queue the next row out, then this row's cursors
+                row_idx, step = a, b
+                open_row(row_idx + step, step)
+                row = self._rows[row_idx]
+                cols = self._row_cols[row]
+                lat_term, cos_min = self._row_bounds(row, lat)
+                cos_factor = max(0.0, cos_q) * cos_min
+                first = bisect.bisect_left(cols, qcol)
+                push_cell(row, cols, first, 1, 0, lat_term, cos_factor)
+                push_cell(row, cols, first - 1, -1, 0, lat_term, cos_factor)
+                continue
+
+            row, direction = a, b
+            cols, idx, taken, lat_term, cos_factor = cursor
+            yield bound, self._cells[(row, cols[idx])]
+            push_cell(row, cols, idx + direction, direction, taken + 1, lat_term, cos_factor)
+
+    def query(self, lat: float, lon: float,
+              radius_km: Optional[float] = None, k: Optional[int] = None,
+              campus_coverage: Optional[List[Dict[str, Any]]] = None,
+              brand: Optional[str] = None, state: Optional[str] = None) -> List[Tuple[float, int]]:
+        """
+        Campuses within `radius_km` and/or the `k` nearest, closest first.
+        Brand and state filters need `campus_coverage` to look fields up.
+        """
+        best: List[Tuple[float, int]] = []  # max-heap of (-distance, -position) when k is set
+        found: List[Tuple[float, int]] = []
+
+        for bound, slots in self._walk(lat, lon):
+            if radius_km is not None and bound > radius_km:
+                break
+            if k is not None and len(best) >= k and bound > -best[0][0]:
+                break
+
+            for slot in slots:
+                position = self._positions[slot]
+                if campus_coverage is not None:
+                    campus = campus_coverage[position]
+                    if brand is not None and campus.get('brand') != brand:
+                        continue
+                    if state is not None and campus.get('state') != state:
+                        continue
+
+                distance = haversine_km(lat, lon, *self._points[slot])
+                if radius_km is not None and distance > radius_km:
+                    continue
+                if k is None:
+                    found.append((distance, position))
+                elif len(best) < k:
+                    heapq.heappush(best, (-distance, -position))
+                elif (distance, position) < (-best[0][0], -best[0][1]):
+                    heapq.heapreplace(best, (-distance, -position))
+
+        if k is not None:
+            found = [(-d, -p) for d, p in best]
+        found.sort()
+        return found
@@ -0,0 +1,283 @@
+"""
+Offline compiler for the intelligence data files.
+
+Validates the raw files in a source directory and emits a single versioned,
+checksummed artifact with every lookup index prebuilt:
+
+    python -m app.compiler --source app/dist --output app/dist/intel.bundle
+
+Exits non-zero, without writing anything, if validation fails.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import string
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .campus_index import CampusIndex
+from .runtime import (
+    ARTIFACT_FILE,
+    ARTIFACT_FORMAT_VERSION,
+    ARTIFACT_MAGIC,
+    DATA_FILES,
+    _build_campus_indexes,
+    _build_pitch_template_index,
+)
+
+# Files that may be absent from a source directory
+OPTIONAL_FILES = {'pitch_templates', 'localized_pitch_templates'}
+
+# Fields build_pitch can substitute into a pitch template
+TEMPLATE_FIELDS = {'college_name', 'college_short', 'city', 'course', 'location'}
+
+
+def read_sources(source_dir: Path) -> Tuple[Dict[str, Any], Dict[str, str], List[str]]:
+    """
+    Read every raw data file.
+    Returns (data by attribute, sha256 by filename, errors).
+    """
+    data = {}
+    checksums = {}
+    errors = []
+    for attr, filename in DATA_FILES.items():
+        path = source_dir / filename
+        if not path.is_file():
+            if attr not in OPTIONAL_FILES:
+                errors.append(f"{filename}: missing")
+            data[attr] = [] if attr == 'campus_coverage' else {}
+            continue
+
+        raw = path.read_bytes()
+        checksums[filename] = hashlib.sha256(raw).hexdigest()
+        try:
+            data[attr] = json.loads(gzip.decompress(raw) if filename.endswith('.gz') else raw)
+        except Exception as e:
+            errors.append(f"{filename}: could not parse: {e}")
+            data[attr] = [] if attr == 'campus_coverage' else {}
+    return data, checksums, errors
+
+
+def _check_template(where: str, template: Any, errors: List[str]) -> None:
+    if not isinstance(template, str):
+        errors.append(f"{where}: template must be a string")
+        return
+    try:
+        fields = {name for _, name, _, _ in string.Formatter().parse(template) if name is not None}
+    except ValueError as e:
+        errors.append(f"{where}: malformed template: {e}")
+        return
+    for field in sorted(fields - TEMPLATE_FIELDS):
+        errors.append(f"{where}: unknown placeholder {{{field}}}")
+
+
+def validate_campus_coverage(campus_coverage: Any, colleges: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Check campus fields, coordinates and brand references."""
+    errors, warnings = [], []
+    if not isinstance(campus_coverage, list):
+        return ["campus_coverage.json.gz: must be a list of campuses"], warnings
+
+    for i, campus in enumerate(campus_coverage):
+        where = f"campus_coverage.json.gz[{i}]"
+        if not isinstance(campus, dict):
+            errors.append(f"{where}: must be an object")
+            continue
+        for field in ('city', 'state', 'brand'):
+            if not isinstance(campus.get(field), str) or not campus.get(field):
+                errors.append(f"{where}: missing {field}")
+        if isinstance(campus.get('brand'), str) and campus['brand'] and campus['brand'] not in colleges:
+            errors.append(f"{where}: brand {campus['brand']!r} is not in brand_registry colleges")
+
+        lat, lon = campus.get('latitude'), campus.get('longitude')
+        if lat is None or lon is None:
+            warnings.append(f"{where}: no coordinates, distance checks will be skipped")
+        elif not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+            errors.append(f"{where}: coordinates must be numbers")
+        elif not -90 <= lat <= 90 or not -180 <= lon <= 180:
+            errors.append(f"{where}: coordinates ({lat}, {lon}) out of range")
+    return errors, warnings
+
+
+def validate_brand_registry(brand_registry: Any, localized_pitch_templates: Any) -> List[str]:
+    """Check registry shape, category references and template placeholders."""
+    errors = []
+    if not isinstance(brand_registry, dict):
+        return ["brand_registry.json: must be an object"]
+
+    categories = brand_registry.get('brand_categories', {})
+    if not isinstance(categories, dict):
+        errors.append("brand_registry.json: brand_categories must be an object")
+        categories = {}
+    for category, category_info in categories.items():
+        where = f"brand_registry.json: brand_categories.{category}"
+        if not isinstance(category_info, dict):
+            errors.append(f"{where}: must be an object")
+        elif 'template' in category_info:
+            _check_template(where, category_info['template'], errors)
+
+    colleges = brand_registry.get('colleges', {})
+    if not isinstance(colleges, dict):
+        errors.append("brand_registry.json: colleges must be an object")
+        colleges = {}
+    for code, college_info in colleges.items():
+        where = f"brand_registry.json: colleges.{code}"
+        if not isinstance(college_info, dict):
+            errors.append(f"{where}: must be an object")
+            continue
+        for field in ('name', 'short', 'caller_name'):
+            if field in college_info and not isinstance(college_info[field], str):
+                errors.append(f"{where}: {field} must be a string")
+        category = college_info.get('category', 'medium')
+        if not isinstance(category, str) or category not in categories:
+            errors.append(f"{where}: unknown category {category!r}")
+
+    if not isinstance(localized_pitch_templates, dict):
+        return errors + ["localized_pitch_templates.json: must be an object"]
+    for language, templates in localized_pitch_templates.items():
+        if not isinstance(templates, dict):
+            errors.append(f"localized_pitch_templates.json: {language}: must be an object of category templates")
+            continue
+        for category, template in templates.items():
+            where = f"localized_pitch_templates.json: {language}.{category}"
+            if category not in categories:
+                errors.append(f"{where}: unknown category {category!r}")
+            _check_template(where, template, errors)
+    return errors
+
+
+def validate_languages(bot_language_support: Any, state_language_map: Any) -> List[str]:
+    """Check that every language fallback chain ends at an enabled language without cycles."""
+    errors = []
+    if not isinstance(bot_language_support, dict):
+        return ["bot_language_support.json: must be an object"]
+
+    valid = {}
+    for language, config in bot_language_support.items():
+        if not isinstance(config, dict):
+            errors.append(f"bot_language_support.json: {language}: must be an object")
+        elif not isinstance(config.get('fallback_to', 'English'), str):
+            errors.append(f"bot_language_support.json: {language}: fallback_to must be a language name")
+        else:
+            valid[language] = config
+
+    for language in valid:
+        chain = [language]
+        current = language
+        while current != 'English':
+            config = valid.get(current)
+            if config is None:
+                if current not in bot_language_support:
+                    errors.append(f"bot_language_support.json: {language}: fallback {current!r} is not a known language")
+                break
+            if config.get('enabled', 0) == 1:
+                break
+            current = config.get('fallback_to', 'English')
+            if current in chain:
+                errors.append(f"bot_language_support.json: {language}: fallback cycle {' -> '.join(chain + [current])}")
+                break
+            chain.append(current)
+
+    if not isinstance(state_language_map, dict):
+        return errors + ["state_language_map.json: must be an object"]
+    for state, languages in state_language_map.items():
+        if not isinstance(languages, list) or not all(isinstance(lang, str) for lang in languages):
+            errors.append(f"state_language_map.json: {state}: must be a list of language names")
+    return errors
+
+
+def validate(data: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Validate a full set of source data. Returns (errors, warnings)."""
+    brand_registry = data['brand_registry']
+    colleges = brand_registry.get('colleges') if isinstance(brand_registry, dict) else None
+
+    errors, warnings = validate_campus_coverage(data['campus_coverage'], colleges if isinstance(colleges, dict) else {})
+    errors += validate_brand_registry(brand_registry, data['localized_pitch_templates'])
+    errors += validate_languages(data['bot_language_support'], data['state_language_map'])
+    return errors, warnings
+
+
+def build_artifact(data: Dict[str, Any], source_checksums: Dict[str, str]) -> bytes:
+    """Prebuild every lookup index and pack everything into one artifact."""
+    pitch_template_index = _build_pitch_template_index(data['brand_registry'], data['localized_pitch_templates'])
+    campus_city_index, campus_city_state_index, campus_state_positions, default_brand_by_state = (
+        _build_campus_indexes(data['campus_coverage'])
+    )
+
+    payload = {
+        'data': data,
+        'indexes': {
+            'pitch_templates': sorted(
+                [brand, language, category, template]
+                for (brand, language), (category, template) in pitch_template_index.items()
+            ),
+            'campus_city': campus_city_index,
+            'campus_city_state': [
+                [city, state, lat, lon] for (city, state), (lat, lon) in campus_city_state_index.items()
+            ],
+            'campus_state_positions': campus_state_positions,
+            'default_brand_by_state': default_brand_by_state,
+            'campus_grid': CampusIndex(data['campus_coverage']).to_payload(),
+        },
+    }
+    body = gzip.compress(
+        json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8'),
+        mtime=0,
+    )
+    header = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'checksum': 'sha256:' + hashlib.sha256(body).hexdigest(),
+        'built_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'sources': source_checksums,
+        'counts': {
+            'campuses': len(data['campus_coverage']),
+            'colleges': len(data['brand_registry'].get('colleges', {})),
+            'pitch_templates': len(pitch_template_index),
+        },
+    }
+    return ARTIFACT_MAGIC + b'\n' + json.dumps(header, sort_keys=True).encode('utf-8') + b'\n' + body
+
+
+def compile_dataset(source_dir: Path, output: Path) -> Tuple[List[str], List[str]]:
+    """Validate `source_dir` and write the artifact to `output` if it is clean."""
+    data, checksums, errors = read_sources(source_dir)
+    validation_errors, warnings = validate(data)
+    errors += validation_errors
+    if not errors:
+        output.write_bytes(build_artifact(data, checksums))
+    return errors, warnings
+
+
+def main(argv: List[str] = None) -> int:
+    default_source = Path(__file__).resolve().parent / 'dist'
+    parser = argparse.ArgumentParser(prog='python -m app.compiler', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--source', type=Path, default=default_source, help="directory with the raw data files")
+    parser.add_argument('--output', type=Path, help=f"artifact path (default: <source>/{ARTIFACT_FILE})")
+    parser.add_argument('--check', action='store_true', help="validate only, do not write the artifact")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        data, _, errors = read_sources(args.source)
+        validation_errors, warnings = validate(data)
+        errors += validation_errors
+    else:
+        output = args.output or args.source / ARTIFACT_FILE
+        errors, warnings = compile_dataset(args.source, output)
+
+    for warning in warnings:
+        print(f"warning: {warning}", file=sys.stderr)
+    for error in errors:
+        print(f"error: {error}", file=sys.stderr)
+
+    if errors:
+        print(f"{len(errors)} error(s), nothing written", file=sys.stderr)
+        return 1
+    if not args.check:
+        print(f"Wrote {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
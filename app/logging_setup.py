@@ -0,0 +1,220 @@
+"""
+Logging configuration.
+
+LOG_FORMAT=text (default) keeps plain synchronous logging. LOG_FORMAT=json
+puts a queue in front of stdout: request threads only enqueue the record,
+and a background thread formats records as JSON lines and writes them in
+batches. Success logs can be sampled with LOG_SUCCESS_SAMPLE_RATE; errors
+are never sampled.
+
+When the queue is full, warnings and errors are written synchronously
+instead of being dropped; lower levels are dropped and counted, and the
+writer reports the count every LOG_DROP_REPORT_INTERVAL seconds.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import IO, List, Optional
+
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text').lower()
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_SUCCESS_SAMPLE_RATE = float(os.environ.get('LOG_SUCCESS_SAMPLE_RATE', '1.0'))
+LOG_BATCH_SIZE = int(os.environ.get('LOG_BATCH_SIZE', '256'))
+LOG_FLUSH_INTERVAL = float(os.environ.get('LOG_FLUSH_INTERVAL', '0.5'))
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+LOG_DROP_REPORT_INTERVAL = float(os.environ.get('LOG_DROP_REPORT_INTERVAL', '60'))
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
+
+
+def should_log_success() -> bool:
+    """Sampling decision for a success log line."""
+    return LOG_SUCCESS_SAMPLE_RATE >= 1.0 or random.random() < LOG_SUCCESS_SAMPLE_RATE
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with `extra` fields at the top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks or formats on the calling thread while
+    the queue has room. If the queue is full, records at `fallback_level`
+    and above go synchronously through `fallback`; the rest are dropped
+    and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue, fallback: Optional[logging.Handler] = None,
+                 fallback_level: int = logging.WARNING):
+        super().__init__(log_queue)
+        self.fallback = fallback
+        self.fallback_level = fallback_level
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the writer thread; tracebacks are rendered
+        # now because they cannot outlive the frame that raised them
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.fallback is not None and record.levelno >= self.fallback_level:
+                self.fallback.handle(record)
+            else:
+                # Request threads drop concurrently while the queue is full
+                with self._dropped_lock:
+                    self.dropped += 1
+
+
+class BatchWriter(threading.Thread):
+    """
+    Drains the log queue and writes formatted records in batches.
+    If `handler` is given, records it dropped are reported as a warning
+    line at most every `report_interval` seconds. Writes hold `lock`, which
+    should be the lock of any handler sharing the stream.
+    """
+
+    _STOP = object()
+
+    def __init__(self, log_queue: queue.Queue, stream: IO[str], formatter: logging.Formatter,
+                 batch_size: int = LOG_BATCH_SIZE, flush_interval: float = LOG_FLUSH_INTERVAL,
+                 handler: Optional[NonBlockingQueueHandler] = None,
+                 report_interval: float = LOG_DROP_REPORT_INTERVAL,
+                 lock: Optional[threading.RLock] = None):
+        super().__init__(name='log-writer', daemon=True)
+        self.queue = log_queue
+        self.stream = stream
+        self.formatter = formatter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.handler = handler
+        self.report_interval = report_interval
+        self.lock = lock or threading.RLock()
+        self.reported = 0
+        self._last_report = time.monotonic()
+
+    def run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[logging.LogRecord] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            if stopping or time.monotonic() - self._last_report >= self.report_interval:
+                report = self._drop_report()
+                if report is not None:
+                    batch.append(report)
+            if batch:
+                self._write(batch)
+
+    def _drop_report(self) -> Optional[logging.LogRecord]:
+        """A warning record for drops since the last report, if there were any."""
+        self._last_report = time.monotonic()
+        if self.handler is None:
+            return None
+        total = self.handler.dropped
+        count = total - self.reported
+        if count <= 0:
+            return None
+        self.reported = total
+        record = logging.LogRecord(__name__, logging.WARNING, __file__, 0,
+                                   "Dropped %d log records, the log queue was full", (count,), None)
+        record.event = 'log_records_dropped'
+        record.dropped = count
+        record.dropped_total = total
+        return record
+
+    def _write(self, batch: List[logging.LogRecord]) -> None:
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                lines.append(json.dumps({'level': 'ERROR', 'message': f"unformattable log record from {record.name}"}))
+        try:
+            with self.lock:
+                self.stream.write('\n'.join(lines) + '\n')
+                self.stream.flush()
+        except Exception:
+            pass
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush everything queued so far and stop."""
+        self.queue.put(self._STOP)
+        self.join(timeout)
+
+
+_writer: Optional[BatchWriter] = None
+
+
+def dropped_log_records() -> int:
+    """Records dropped by the JSON log queue since logging was configured."""
+    if _writer is None or _writer.handler is None:
+        return 0
+    return _writer.handler.dropped
+
+
+def configure_logging(log_format: str = LOG_FORMAT, level: str = LOG_LEVEL, stream: IO[str] = sys.stdout) -> None:
+    """Set up root logging in text or queued JSON mode."""
+    global _writer
+
+    if log_format != 'json':
+        logging.basicConfig(level=level)
+        return
+
+    if _writer is not None:
+        _writer.stop()
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    # Warnings and errors that do not fit in the queue are written directly,
+    # under the same lock as the batches so lines never interleave
+    fallback = logging.StreamHandler(stream)
+    fallback.setFormatter(JsonFormatter())
+    handler = NonBlockingQueueHandler(log_queue, fallback=fallback)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _writer = BatchWriter(log_queue, stream, JsonFormatter(), handler=handler, lock=fallback.lock)
+    _writer.start()
+    atexit.register(_writer.stop)
@@ -1,19 +1,33 @@
 """
 FastAPI application for lead enrichment microservice.
 """
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+import base64
+import hashlib
+import json
 import logging
-from .runtime import enrich_lead
+from .runtime import enrich_lead, resolve_city_coordinates, search_campuses, use_dataset
+from .tenants import TENANTS, UnknownTenantError
+from .warmup import READINESS, start_warmup
+from .logging_setup import configure_logging, dropped_log_records, should_log_success
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.warmup = start_warmup()
+    yield
+
 app = FastAPI(
     title="Lead Intelligence API",
     description="AI dialer lead enrichment microservice",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 class LeadRequest(BaseModel):
@@ -31,8 +45,33 @@ class LeadResponse(BaseModel):
     language: Optional[str]
     caller_name: str
     pitch_text: str
+    pitch_key: Optional[str] = Field(default=None, description="Stable cache key for the rendered pitch")
     tts_languages: List[str]
 
+# Largest search radius; k-nearest queries never look further than this
+NEARBY_MAX_RADIUS_KM = 2000.0
+
+class NearbyCampusesResponse(BaseModel):
+    latitude: float
+    longitude: float
+    campuses: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+def _encode_cursor(offset: int, fingerprint: str) -> str:
+    raw = json.dumps({"o": offset, "q": fingerprint}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str, fingerprint: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        offset = int(data["o"])
+    except Exception:
+        raise HTTPException(status_code=422, detail="invalid_cursor")
+    if data.get("q") != fingerprint or offset < 0:
+        raise HTTPException(status_code=422, detail="invalid_cursor")
+    return offset
+
 @app.get("/")
 def read_root():
     return {"message": "Lead Intelligence API is running!"}
@@ -41,20 +80,93 @@ def read_root():
 def health_check():
     return {"status": "healthy", "service": "lead-intel-api"}
 
-@app.post("/enrich_lead", response_model=LeadResponse)
-def enrich_lead_endpoint(lead: LeadRequest):
+@app.get("/ready")
+def readiness_check():
+    status_code = 200 if READINESS.ready else 503
+    return JSONResponse(status_code=status_code, content={
+        **READINESS.snapshot(), "log_records_dropped": dropped_log_records(), "service": "lead-intel-api"
+    })
+
+def _enrich_for_tenant(lead: LeadRequest, tenant_id: Optional[str]) -> LeadResponse:
+    try:
+        dataset = TENANTS.get(tenant_id)
+    except UnknownTenantError:
+        raise HTTPException(status_code=404, detail="unknown_tenant")
+
     try:
         lead_dict = lead.model_dump()
-        enriched_lead = enrich_lead(lead_dict)
-        logger.info(f"Successfully enriched lead for state: {lead.state}")
+        with use_dataset(dataset):
+            enriched_lead = enrich_lead(lead_dict)
+        if logger.isEnabledFor(logging.INFO) and should_log_success():
+            logger.info("Successfully enriched lead for state: %s", lead.state,
+                        extra={"event": "lead_enriched", "state": lead.state, "tenant": dataset.name})
         return LeadResponse(**enriched_lead)
     except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
+        logger.error("Validation error: %s", e, extra={"event": "validation_error", "tenant": dataset.name})
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
-        logger.error(f"Internal error: {str(e)}")
+        logger.error("Internal error: %s", e, exc_info=True, extra={"event": "internal_error", "tenant": dataset.name})
         raise HTTPException(status_code=500, detail="internal_error")
 
+@app.post("/enrich_lead", response_model=LeadResponse)
+def enrich_lead_endpoint(lead: LeadRequest, x_tenant_id: Optional[str] = Header(default=None)):
+    return _enrich_for_tenant(lead, x_tenant_id)
+
+@app.post("/tenants/{tenant_id}/enrich_lead", response_model=LeadResponse)
+def tenant_enrich_lead_endpoint(tenant_id: str, lead: LeadRequest):
+    return _enrich_for_tenant(lead, tenant_id)
+
+@app.get("/campuses/nearby", response_model=NearbyCampusesResponse)
+def nearby_campuses_endpoint(
+    lat: Optional[float] = Query(default=None, ge=-90, le=90, description="Latitude of the search point"),
+    lon: Optional[float] = Query(default=None, ge=-180, le=180, description="Longitude of the search point"),
+    city: Optional[str] = Query(default=None, description="City to search around (instead of lat/lon)"),
+    state: Optional[str] = Query(default=None, description="State of the city, also used as a filter"),
+    radius_km: Optional[float] = Query(default=None, gt=0, le=NEARBY_MAX_RADIUS_KM, description="Search radius in km"),
+    k: Optional[int] = Query(default=None, ge=1, le=1000, description=f"Return only the k nearest campuses (within {NEARBY_MAX_RADIUS_KM:g} km)"),
+    brand: Optional[str] = Query(default=None, description="Only campuses of this brand"),
+    limit: int = Query(default=20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    x_tenant_id: Optional[str] = Header(default=None),
+):
+    if radius_km is None:
+        radius_km = 30.0 if k is None else NEARBY_MAX_RADIUS_KM
+
+    try:
+        dataset = TENANTS.get(x_tenant_id)
+    except UnknownTenantError:
+        raise HTTPException(status_code=404, detail="unknown_tenant")
+
+    with use_dataset(dataset):
+        if lat is not None and lon is not None:
+            origin = (lat, lon)
+        elif city:
+            origin = resolve_city_coordinates(city, state or "")
+            if origin is None:
+                raise HTTPException(status_code=404, detail="unknown_city")
+        else:
+            raise HTTPException(status_code=422, detail="lat and lon, or city, are required")
+
+        query = [dataset.name, origin, radius_km, k, brand, state]
+        fingerprint = hashlib.sha1(json.dumps(query).encode()).hexdigest()[:12]
+        offset = _decode_cursor(cursor, fingerprint) if cursor else 0
+
+        campuses, has_more = search_campuses(
+            origin[0], origin[1], radius_km=radius_km, k=k,
+            brand=brand, state=state, offset=offset, limit=limit,
+        )
+
+    return NearbyCampusesResponse(
+        latitude=origin[0],
+        longitude=origin[1],
+        campuses=campuses,
+        next_cursor=_encode_cursor(offset + len(campuses), fingerprint) if has_more else None,
+    )
+
+@app.get("/tenants")
+def tenant_stats():
+    return TENANTS.stats()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
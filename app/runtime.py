@@ -1,29 +1,384 @@
 """
 Runtime helper functions for lead enrichment.
 """
+import gzip
 import json
+import sys
+import time
+import threading
+import hashlib
 import importlib.resources
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from geopy.distance import geodesic
+from .campus_index import CampusIndex
 
 
-# Load JSON data once at import time
-def _load_json_data(filename: str) -> Any:
-    """Load JSON data from app/dist/ directory."""
+# Intelligence files that make up one dataset, keyed by attribute name
+DATA_FILES = {
+    'state_language_map': 'state_language_map.json',
+    'campus_coverage': 'campus_coverage.json.gz',
+    'brand_registry': 'brand_registry.json',
+    'pitch_templates': 'pitch_templates.json',
+    'bot_language_support': 'bot_language_support.json',
+    'localized_pitch_templates': 'localized_pitch_templates.json',
+}
+
+# Compiled artifact produced by `python -m app.compiler`
+ARTIFACT_FILE = 'intel.bundle'
+ARTIFACT_MAGIC = b'LEADINTEL'
+ARTIFACT_FORMAT_VERSION = 2
+
+# English pitch for low category nurture leads, which have no city
+NURTURE_PITCH_TEMPLATE = (
+    "Hi, I'm calling from Sunstone in {location}. I noticed you're interested in {course}. "
+    "Would you like to know more about our programs?"
+)
+
+# Maximum number of rendered pitches kept in memory per dataset
+PITCH_CACHE_SIZE = 4096
+
+# Maximum number of unresolved (city, state) pairs remembered per dataset
+UNRESOLVED_CITY_CACHE_SIZE = 10000
+
+# Used to reserve memory for full caches: bytes of bookkeeping per cache
+# entry, and ASCII characters allowed for each request field (course, city, state)
+_CACHE_ENTRY_BYTES = 128
+_CACHE_FIELD_CHARS = 64
+
+
+def _load_json_data(filename: str, root: Optional[Any] = None) -> Any:
+    """Load JSON data from app/dist/ directory, or from `root` if given."""
     try:
-        with importlib.resources.files('app.dist').joinpath(filename).open('r') as f:
+        if root is None:
+            root = importlib.resources.files('app.dist')
+        if filename.endswith('.gz'):
+            return json.loads(gzip.decompress(root.joinpath(filename).read_bytes()))
+        with root.joinpath(filename).open('r') as f:
             return json.load(f)
     except Exception as e:
         print(f"Warning: Could not load {filename}: {e}")
         return {}
 
 
-# Load all intelligence files
-STATE_LANGUAGE_MAP = _load_json_data('state_language_map.json')
-CAMPUS_COVERAGE = _load_json_data('campus_coverage.json.gz')
-BRAND_REGISTRY = _load_json_data('brand_registry.json')
-PITCH_TEMPLATES = _load_json_data('pitch_templates.json')
-BOT_LANGUAGE_SUPPORT = _load_json_data('bot_language_support.json')
+def _deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """Approximate memory footprint of a JSON-like object in bytes."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+class _PartialFormat(dict):
+    """Format mapping that leaves unknown placeholders untouched."""
+
+    def __missing__(self, key: str) -> str:
+        return '{' + key + '}'
+
+
+def _build_pitch_template_index(brand_registry: Dict[str, Any],
+                                localized_pitch_templates: Dict[str, Any]) -> Dict[Tuple[str, str], Tuple[str, str]]:
+    """
+    Pre-render the pitch template for every (brand, language) pair.
+    Brand fields are filled in up front so only course and city remain.
+    A low category nurture brand keeps its fixed English wording.
+    Malformed entries are skipped; `python -m app.compiler` reports them.
+    """
+    index = {}
+    colleges = brand_registry.get('colleges') if isinstance(brand_registry, dict) else None
+    categories = brand_registry.get('brand_categories') if isinstance(brand_registry, dict) else None
+    colleges = colleges if isinstance(colleges, dict) else {}
+    categories = categories if isinstance(categories, dict) else {}
+    if not isinstance(localized_pitch_templates, dict):
+        localized_pitch_templates = {}
+
+    for brand, college_info in colleges.items():
+        if not isinstance(college_info, dict):
+            continue
+        category = college_info.get('category', 'medium')
+        if not isinstance(category, str):
+            continue
+        brand_fields = _PartialFormat(
+            college_name=college_info.get('name', brand),
+            college_short=college_info.get('short', brand),
+        )
+
+        templates = {}
+        category_info = categories.get(category)
+        if brand == 'nurture' and category == 'low' and isinstance(category_info, dict):
+            templates['English'] = NURTURE_PITCH_TEMPLATE
+        elif isinstance(category_info, dict) and category_info.get('template'):
+            templates['English'] = category_info['template']
+        for language, localized in localized_pitch_templates.items():
+            if isinstance(localized, dict) and localized.get(category):
+                templates[language] = localized[category]
+
+        for language, template in templates.items():
+            if not isinstance(template, str):
+                continue
+            try:
+                index[(brand, language)] = (category, template.format_map(brand_fields))
+            except (ValueError, IndexError) as e:
+                print(f"Warning: Invalid {language} pitch template for {brand}: {e}")
+
+    return index
+
+
+def _build_campus_indexes(campus_coverage: List[Dict[str, Any]]) -> Tuple[
+        Dict[str, Tuple[Any, Any]], Dict[Tuple[str, Any], Tuple[Any, Any]], Dict[Any, List[int]], Dict[Any, Any]]:
+    """
+    Index campuses by city and by state.
+    Returns (lowercased city -> coordinates of its first campus,
+    (lowercased city, state) -> coordinates of the first campus there,
+    state -> positions in campus_coverage,
+    state -> brand of its first campus).
+    """
+    city_index = {}
+    city_state_index = {}
+    state_positions = {}
+    default_brand_by_state = {}
+    for position, campus in enumerate(campus_coverage):
+        if not isinstance(campus, dict):
+            continue
+        city = str(campus.get('city', '')).lower()
+        state = campus.get('state')
+        coords = (campus.get('latitude'), campus.get('longitude'))
+        city_index.setdefault(city, coords)
+        city_state_index.setdefault((city, state), coords)
+        state_positions.setdefault(state, []).append(position)
+        # Brand picked for a state when the city gives no better answer
+        default_brand_by_state.setdefault(state, campus.get('brand'))
+    return city_index, city_state_index, state_positions, default_brand_by_state
+
+
+def read_artifact(data: bytes) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Verify and decode a compiled artifact.
+    Returns (header, payload); raises ValueError if the artifact is unusable.
+    """
+    magic, _, rest = data.partition(b'\n')
+    header_line, _, body = rest.partition(b'\n')
+    if magic != ARTIFACT_MAGIC:
+        raise ValueError("not a lead intelligence artifact")
+
+    header = json.loads(header_line)
+    if header.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"unsupported artifact format {header.get('format_version')}")
+    if header.get('checksum') != 'sha256:' + hashlib.sha256(body).hexdigest():
+        raise ValueError("artifact checksum mismatch")
+
+    return header, json.loads(gzip.decompress(body))
+
+
+def _stale_sources(data: bytes, root: Any) -> List[str]:
+    """
+    Raw data files in `root` that differ from the ones an artifact was
+    compiled from. Files absent from `root` are not checked.
+    """
+    header = json.loads(data.split(b'\n', 2)[1])
+    sources = header.get('sources', {})
+    stale = []
+    for filename in DATA_FILES.values():
+        path = root.joinpath(filename)
+        if path.is_file() and sources.get(filename) != hashlib.sha256(path.read_bytes()).hexdigest():
+            stale.append(filename)
+    return stale
+
+
+class IntelDataset:
+    """
+    One complete set of intelligence data plus the indexes derived from it.
+    """
+
+    def __init__(self, name: str = 'default',
+                 state_language_map: Optional[Dict[str, Any]] = None,
+                 campus_coverage: Optional[List[Dict[str, Any]]] = None,
+                 brand_registry: Optional[Dict[str, Any]] = None,
+                 pitch_templates: Optional[Dict[str, Any]] = None,
+                 bot_language_support: Optional[Dict[str, Any]] = None,
+                 localized_pitch_templates: Optional[Dict[str, Any]] = None,
+                 pitch_template_index: Optional[Dict[Tuple[str, str], Tuple[str, str]]] = None,
+                 campus_city_index: Optional[Dict[str, Tuple[Any, Any]]] = None,
+                 campus_city_state_index: Optional[Dict[Tuple[str, Any], Tuple[Any, Any]]] = None,
+                 campus_state_positions: Optional[Dict[Any, List[int]]] = None,
+                 default_brand_by_state: Optional[Dict[Any, Any]] = None,
+                 campus_index: Optional[CampusIndex] = None,
+                 base: Optional['IntelDataset'] = None):
+        self.name = name
+        self.state_language_map = state_language_map if state_language_map is not None else {}
+        self.campus_coverage = campus_coverage if isinstance(campus_coverage, list) else []
+        self.brand_registry = brand_registry if brand_registry is not None else {}
+        self.pitch_templates = pitch_templates if pitch_templates is not None else {}
+        self.bot_language_support = bot_language_support if bot_language_support is not None else {}
+        self.localized_pitch_templates = localized_pitch_templates if localized_pitch_templates is not None else {}
+
+        # Indexes are prebuilt when loading a compiled artifact, and shared
+        # with `base` when the data they are derived from is inherited
+        self._owned_indexes: List[Any] = []
+        self._owned_campus_index = False
+        if (base is not None and self.brand_registry is base.brand_registry
+                and self.localized_pitch_templates is base.localized_pitch_templates):
+            self.pitch_template_index = base.pitch_template_index
+        else:
+            if pitch_template_index is None:
+                pitch_template_index = _build_pitch_template_index(self.brand_registry, self.localized_pitch_templates)
+            self.pitch_template_index = pitch_template_index
+            self._owned_indexes.append(self.pitch_template_index)
+
+        if base is not None and self.campus_coverage is base.campus_coverage:
+            self.campus_city_index = base.campus_city_index
+            self.campus_city_state_index = base.campus_city_state_index
+            self.campuses_by_state = base.campuses_by_state
+            self.campus_index = base.campus_index
+            self.default_brand_by_state = base.default_brand_by_state
+        else:
+            prebuilt = (campus_city_index, campus_city_state_index, campus_state_positions, default_brand_by_state)
+            if any(index is None for index in prebuilt):
+                prebuilt = _build_campus_indexes(self.campus_coverage)
+            (self.campus_city_index, self.campus_city_state_index,
+             campus_state_positions, self.default_brand_by_state) = prebuilt
+            self.campuses_by_state = {
+                state: [self.campus_coverage[i] for i in positions]
+                for state, positions in campus_state_positions.items()
+            }
+            self.campus_index = campus_index if campus_index is not None else CampusIndex(self.campus_coverage)
+            self._owned_indexes += [
+                self.campus_city_index, self.campus_city_state_index, self.campuses_by_state, self.default_brand_by_state,
+            ]
+            self._owned_campus_index = True
+        self.pitch_cache: 'OrderedDict[str, str]' = OrderedDict()
+        self.pitch_cache_lock = threading.Lock()
+        # (city, state) pairs with no nearby campus, mapped to the brand to use instead
+        self.unresolved_cities: 'OrderedDict[Tuple[str, str], Optional[str]]' = OrderedDict()
+        self.unresolved_cities_lock = threading.Lock()
+
+        # Memory the caches above can grow to, reserved up front
+        self.cache_bytes = self._cache_reserve_bytes()
+
+        # Filled in by load()
+        self.load_seconds = 0.0
+        self.size_bytes = 0
+        self.artifact: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def load(cls, name: str = 'default', root: Optional[Any] = None,
+             base: Optional['IntelDataset'] = None) -> 'IntelDataset':
+        """
+        Load a dataset from `root` (defaults to app/dist/).
+        A compiled artifact is preferred when present, unless raw files next
+        to it have changed since it was compiled; otherwise the raw files are
+        read, and files missing from `root` are inherited from `base` when
+        one is given.
+        """
+        if root is None:
+            root = importlib.resources.files('app.dist')
+
+        artifact = root.joinpath(ARTIFACT_FILE)
+        if artifact.is_file():
+            try:
+                artifact_data = artifact.read_bytes()
+                stale = _stale_sources(artifact_data, root)
+                if not stale:
+                    return cls.from_artifact(artifact_data, name=name)
+                print(f"Warning: {ARTIFACT_FILE} is out of date ({', '.join(stale)} changed since it was compiled), "
+                      f"loading raw files instead; run `python -m app.compiler`")
+            except Exception as e:
+                print(f"Warning: Could not load {ARTIFACT_FILE}, falling back to raw files: {e}")
+
+        started = time.perf_counter()
+        data = {}
+        owned = []
+        for attr, filename in DATA_FILES.items():
+            if base is not None and not root.joinpath(filename).is_file():
+                data[attr] = getattr(base, attr)
+            else:
+                data[attr] = _load_json_data(filename, root)
+                owned.append(data[attr])
+
+        dataset = cls(name=name, base=base, **data)
+        dataset.load_seconds = time.perf_counter() - started
+        dataset.size_bytes = dataset._owned_sizeof(owned)
+        return dataset
+
+    @classmethod
+    def from_artifact(cls, data: bytes, name: str = 'default') -> 'IntelDataset':
+        """Build a dataset from a compiled artifact in a single step."""
+        started = time.perf_counter()
+        header, payload = read_artifact(data)
+        indexes = payload['indexes']
+
+        dataset = cls(
+            name=name,
+            pitch_template_index={(b, l): (c, t) for b, l, c, t in indexes['pitch_templates']},
+            campus_city_index={city: tuple(coords) for city, coords in indexes['campus_city'].items()},
+            campus_city_state_index={(city, state): (lat, lon) for city, state, lat, lon in indexes['campus_city_state']},
+            campus_state_positions=indexes['campus_state_positions'],
+            default_brand_by_state=indexes['default_brand_by_state'],
+            campus_index=CampusIndex.from_payload(indexes['campus_grid']),
+            **payload['data'],
+        )
+        dataset.artifact = header
+        dataset.load_seconds = time.perf_counter() - started
+        dataset.size_bytes = dataset._owned_sizeof(list(payload['data'].values()))
+        return dataset
+
+    def _owned_sizeof(self, owned_data: List[Any]) -> int:
+        """Memory held by this dataset alone; anything shared with a base is not counted."""
+        seen = set()
+        size = sum(_deep_sizeof(obj, seen) for obj in owned_data + self._owned_indexes)
+        if self._owned_campus_index:
+            size += self.campus_index.sizeof()
+        return size
+
+    def _cache_reserve_bytes(self) -> int:
+        """Worst-case memory of the pitch and unresolved city caches once full."""
+        field_bytes = sys.getsizeof('x' * _CACHE_FIELD_CHARS)
+        size = UNRESOLVED_CITY_CACHE_SIZE * (_CACHE_ENTRY_BYTES + sys.getsizeof(('', '')) + 2 * field_bytes)
+        if self.pitch_template_index:
+            key_chars = max(len(brand) + len(language) for brand, language in self.pitch_template_index) + 22
+            text_bytes = max(sys.getsizeof(template) for _, template in self.pitch_template_index.values())
+            size += PITCH_CACHE_SIZE * (_CACHE_ENTRY_BYTES + sys.getsizeof('x' * key_chars)
+                                        + text_bytes + 2 * field_bytes)
+        return size
+
+
+# Load the default intelligence files once at import time
+DEFAULT_DATASET = IntelDataset.load()
+
+# Module-level aliases for the default dataset
+STATE_LANGUAGE_MAP = DEFAULT_DATASET.state_language_map
+CAMPUS_COVERAGE = DEFAULT_DATASET.campus_coverage
+BRAND_REGISTRY = DEFAULT_DATASET.brand_registry
+PITCH_TEMPLATES = DEFAULT_DATASET.pitch_templates
+BOT_LANGUAGE_SUPPORT = DEFAULT_DATASET.bot_language_support
+LOCALIZED_PITCH_TEMPLATES = DEFAULT_DATASET.localized_pitch_templates
+
+_ACTIVE_DATASET: ContextVar[Optional[IntelDataset]] = ContextVar('active_dataset', default=None)
+
+
+def current_dataset() -> IntelDataset:
+    """Return the dataset serving the current request."""
+    return _ACTIVE_DATASET.get() or DEFAULT_DATASET
+
+
+@contextmanager
+def use_dataset(dataset: IntelDataset) -> Iterator[IntelDataset]:
+    """Serve everything inside the block from `dataset`."""
+    token = _ACTIVE_DATASET.set(dataset)
+    try:
+        yield dataset
+    finally:
+        _ACTIVE_DATASET.reset(token)
 
 
 def choose_tts_languages(ideal_lang: str) -> List[str]:
@@ -32,10 +387,11 @@ def choose_tts_languages(ideal_lang: str) -> List[str]:
     Always ends with English as fallback.
     """
     languages = []
+    bot_language_support = current_dataset().bot_language_support
     
     # Check if ideal language is enabled
-    if ideal_lang in BOT_LANGUAGE_SUPPORT:
-        lang_config = BOT_LANGUAGE_SUPPORT[ideal_lang]
+    if ideal_lang in bot_language_support:
+        lang_config = bot_language_support[ideal_lang]
         if lang_config.get('enabled', 0) == 1:
             languages.append(ideal_lang)
         else:
@@ -59,40 +415,36 @@ def _find_nearby_campuses(city: str, state: str, max_distance: float = 30.0) ->
     Find campuses within max_distance km of the given city using real coordinates.
     """
     nearby_campuses = []
+    dataset = current_dataset()
+    state_campuses = dataset.campuses_by_state.get(state, [])
     
     # Get city coordinates (simplified - in real implementation, you'd have a city coordinates database)
-    # For now, we'll use the first campus in the same state as a reference point
-    city_coords = None
-    for campus in CAMPUS_COVERAGE:
-        if campus.get('city', '').lower() == city.lower():
-            city_coords = (campus.get('latitude'), campus.get('longitude'))
-            break
+    # For now, we'll use the first campus in the same city as a reference point
+    city_coords = dataset.campus_city_index.get(city.lower())
     
     # If we don't have exact city coordinates, use state-based filtering
     if not city_coords:
-        for campus in CAMPUS_COVERAGE:
-            if campus.get('state') == state:
-                # Add all campuses in the same state as potential matches
-                campus_copy = campus.copy()
-                campus_copy['distance_km'] = 0  # Assume same state = within range
-                nearby_campuses.append(campus_copy)
+        for campus in state_campuses:
+            # Add all campuses in the same state as potential matches
+            campus_copy = campus.copy()
+            campus_copy['distance_km'] = 0  # Assume same state = within range
+            nearby_campuses.append(campus_copy)
     else:
         # Calculate actual distances using coordinates
-        for campus in CAMPUS_COVERAGE:
-            if campus.get('state') == state:
-                campus_coords = (campus.get('latitude'), campus.get('longitude'))
-                if campus_coords[0] and campus_coords[1]:  # Check if coordinates exist
-                    try:
-                        distance = geodesic(city_coords, campus_coords).kilometers
-                        if distance <= max_distance:
-                            campus_copy = campus.copy()
-                            campus_copy['distance_km'] = distance
-                            nearby_campuses.append(campus_copy)
-                    except Exception:
-                        # Fallback: add campus if coordinates calculation fails
+        for campus in state_campuses:
+            campus_coords = (campus.get('latitude'), campus.get('longitude'))
+            if campus_coords[0] and campus_coords[1]:  # Check if coordinates exist
+                try:
+                    distance = geodesic(city_coords, campus_coords).kilometers
+                    if distance <= max_distance:
                         campus_copy = campus.copy()
-                        campus_copy['distance_km'] = 0
+                        campus_copy['distance_km'] = distance
                         nearby_campuses.append(campus_copy)
+                except Exception:
+                    # Fallback: add campus if coordinates calculation fails
+                    campus_copy = campus.copy()
+                    campus_copy['distance_km'] = 0
+                    nearby_campuses.append(campus_copy)
     
     # Sort by distance (closest first)
     nearby_campuses.sort(key=lambda x: x.get('distance_km', float('inf')))
@@ -100,6 +452,109 @@ def _find_nearby_campuses(city: str, state: str, max_distance: float = 30.0) ->
     return nearby_campuses
 
 
+def pitch_cache_key(brand: str, course: str, language: str, city: str = '') -> Optional[str]:
+    """
+    Stable cache key for the pitch rendered for (brand, course, language).
+    Course and city are keyed exactly as rendered, so two keys are equal
+    only when the texts are. City is only part of the key when the template
+    actually uses it, and the template text is hashed in so keys change
+    whenever the wording does.
+    """
+    entry = current_dataset().pitch_template_index.get((brand, language))
+    if not entry:
+        return None
+
+    _, template = entry
+    if '{city}' not in template and '{location}' not in template:
+        city = ''
+
+    parts = [brand, language, course, city, template]
+    digest = hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()[:20]
+    return f"{brand}:{language}:{digest}"
+
+
+def render_pitch(brand: str, course: str, language: str, city: str = '') -> Optional[Tuple[str, str]]:
+    """
+    Render the pitch for a brand in the given language.
+    Returns (pitch_key, pitch_text), or None if no template exists.
+    """
+    key = pitch_cache_key(brand, course, language, city)
+    if key is None:
+        return None
+
+    dataset = current_dataset()
+    pitch_cache = dataset.pitch_cache
+    with dataset.pitch_cache_lock:
+        pitch_text = pitch_cache.get(key)
+        if pitch_text is not None:
+            pitch_cache.move_to_end(key)
+            return key, pitch_text
+
+    _, template = dataset.pitch_template_index[(brand, language)]
+    pitch_text = template.format_map(_PartialFormat(city=city, location=city, course=course))
+
+    with dataset.pitch_cache_lock:
+        pitch_cache[key] = pitch_text
+        if len(pitch_cache) > PITCH_CACHE_SIZE:
+            pitch_cache.popitem(last=False)
+
+    return key, pitch_text
+
+
+def _render_brand_pitch(brand: str, course: str, language: str, city: str) -> Optional[Tuple[str, str]]:
+    """
+    Render a brand pitch in the requested language, falling back to English.
+    """
+    rendered = None
+    if language != 'English':
+        rendered = render_pitch(brand, course, language, city)
+    if rendered is None:
+        rendered = render_pitch(brand, course, 'English', city)
+    return rendered
+
+
+def resolve_city_coordinates(city: str, state: str = '') -> Optional[Tuple[float, float]]:
+    """
+    Coordinates for a city, taken from its first campus.
+    A campus in the same state is preferred when `state` is given.
+    """
+    dataset = current_dataset()
+    city_key = city.strip().lower()
+    coords = dataset.campus_city_state_index.get((city_key, state)) or dataset.campus_city_index.get(city_key)
+
+    if coords and coords[0] is not None and coords[1] is not None:
+        return coords
+    return None
+
+
+def search_campuses(latitude: float, longitude: float,
+                    radius_km: Optional[float] = None, k: Optional[int] = None,
+                    brand: Optional[str] = None, state: Optional[str] = None,
+                    offset: int = 0, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Campuses within radius_km of a point and/or the k nearest, closest first.
+    Returns (campuses[offset:offset + limit], whether more follow). A page
+    only walks the index as far as its own last result plus one, so wide
+    radius queries cost no more than a k-nearest query of the same depth.
+    """
+    dataset = current_dataset()
+    end = None if limit is None else offset + limit
+    if end is not None:
+        # One extra match tells whether another page follows
+        k = end + 1 if k is None else min(k, end + 1)
+    matches = dataset.campus_index.query(
+        latitude, longitude, radius_km=radius_km, k=k,
+        campus_coverage=dataset.campus_coverage, brand=brand, state=state,
+    )
+
+    page = []
+    for distance, position in matches[offset:end]:
+        campus = dataset.campus_coverage[position].copy()
+        campus['distance_km'] = round(distance, 3)
+        page.append(campus)
+    return page, end is not None and len(matches) > end
+
+
 def _get_highest_brand_campus(campuses: List[Dict[str, Any]]) -> Optional[str]:
     """
     Get the brand with highest priority from nearby campuses.
@@ -110,11 +565,41 @@ def _get_highest_brand_campus(campuses: List[Dict[str, Any]]) -> Optional[str]:
     return None
 
 
+def _resolve_city_brand(city: str, state: str) -> Optional[str]:
+    """
+    Brand to pitch for a city lead.
+    Unknown cities and cities with no campus in range are remembered in a
+    bounded, least recently used negative cache, so repeats cost two dict
+    lookups instead of a scan.
+    """
+    dataset = current_dataset()
+    key = (city.lower(), state)
+    with dataset.unresolved_cities_lock:
+        if key in dataset.unresolved_cities:
+            dataset.unresolved_cities.move_to_end(key)
+            return dataset.unresolved_cities[key]
+
+    if key[0] not in dataset.campus_city_index:
+        # Same answer _find_nearby_campuses gives: first campus in the state
+        brand = dataset.default_brand_by_state.get(state)
+    else:
+        brand = _get_highest_brand_campus(_find_nearby_campuses(city, state))
+        if brand:
+            return brand
+
+    with dataset.unresolved_cities_lock:
+        dataset.unresolved_cities[key] = brand
+        dataset.unresolved_cities.move_to_end(key)
+        if len(dataset.unresolved_cities) > UNRESOLVED_CITY_CACHE_SIZE:
+            dataset.unresolved_cities.popitem(last=False)
+    return brand
+
+
 def _get_college_info(college_code: str) -> Optional[Dict[str, Any]]:
     """
     Get college information from the brand registry.
     """
-    colleges = BRAND_REGISTRY.get('colleges', {})
+    colleges = current_dataset().brand_registry.get('colleges', {})
     return colleges.get(college_code)
 
 
@@ -122,7 +607,7 @@ def _get_brand_category_info(category: str) -> Optional[Dict[str, Any]]:
     """
     Get brand category information from the brand registry.
     """
-    categories = BRAND_REGISTRY.get('brand_categories', {})
+    categories = current_dataset().brand_registry.get('brand_categories', {})
     return categories.get(category)
 
 
@@ -140,15 +625,17 @@ def _build_caller_logic(caller_logic_template: str, college_info: Dict[str, Any]
     return logic
 
 
-def build_pitch(lead: Dict[str, str]) -> Dict[str, str]:
+def build_pitch(lead: Dict[str, str], language: str = 'English') -> Dict[str, Any]:
     """
     Build pitch text and caller name based on lead data.
     Priority: college > city > nurture fallback
+    The pitch is rendered in `language` when a localized template exists.
     """
     college = lead.get('college', '').strip()
     city = lead.get('city', '').strip()
     state = lead.get('state', '').strip()
     course = lead.get('course', '').strip()
+    pitch_key = None
     
     # Case A: College is present
     if college:
@@ -159,18 +646,11 @@ def build_pitch(lead: Dict[str, str]) -> Dict[str, str]:
             
             if category_info:
                 caller_name = college_info.get('caller_name', 'Sunstone Advisor')
-                template = category_info.get('template', 'Hi, I\'m calling about {course}.')
-                
-                # Build pitch text based on category
-                if category == 'high':
-                    # Use college name
-                    pitch_text = template.format(college_name=college_info.get('name', college), course=course)
-                elif category == 'medium':
-                    # Use city + college short
-                    pitch_text = template.format(city=city, college_short=college_info.get('short', college), course=course)
-                else:  # low
-                    # Use city + Sunstone
-                    pitch_text = template.format(city=city, course=course)
+                rendered = _render_brand_pitch(college, course, language, city)
+                if rendered:
+                    pitch_key, pitch_text = rendered
+                else:
+                    pitch_text = f"Hi, I'm calling about {course}."
             else:
                 # Fallback for unknown category
                 caller_name = college_info.get('caller_name', 'Sunstone Advisor')
@@ -182,8 +662,7 @@ def build_pitch(lead: Dict[str, str]) -> Dict[str, str]:
     
     # Case B: City is present (but no college)
     elif city:
-        nearby_campuses = _find_nearby_campuses(city, state)
-        brand = _get_highest_brand_campus(nearby_campuses)
+        brand = _resolve_city_brand(city, state)
         
         if brand:
             college_info = _get_college_info(brand)
@@ -193,15 +672,11 @@ def build_pitch(lead: Dict[str, str]) -> Dict[str, str]:
                 
                 if category_info:
                     caller_name = college_info.get('caller_name', 'Sunstone Advisor')
-                    template = category_info.get('template', 'Hi, I\'m calling about {course}.')
-                    
-                    # Build pitch text based on category
-                    if category == 'high':
-                        pitch_text = template.format(college_name=college_info.get('name', brand), course=course)
-                    elif category == 'medium':
-                        pitch_text = template.format(city=city, college_short=college_info.get('short', brand), course=course)
-                    else:  # low
-                        pitch_text = template.format(city=city, course=course)
+                    rendered = _render_brand_pitch(brand, course, language, city)
+                    if rendered:
+                        pitch_key, pitch_text = rendered
+                    else:
+                        pitch_text = f"Hi, I'm calling about {course}."
                 else:
                     caller_name = college_info.get('caller_name', 'Sunstone Advisor')
                     pitch_text = f"Hi, I'm calling from {college_info.get('name', brand)} about {course} programs."
@@ -217,33 +692,33 @@ def build_pitch(lead: Dict[str, str]) -> Dict[str, str]:
     # Case C: Nurture fallback (no college, no city)
     else:
         nurture_info = _get_college_info('nurture')
-        if nurture_info:
+        location = city if city else state
+        # The location fills both {city} and {location}; in English a low
+        # category nurture brand renders NURTURE_PITCH_TEMPLATE
+        rendered = _render_brand_pitch('nurture', course, language, location) if nurture_info else None
+        if rendered:
+            caller_name = nurture_info.get('caller_name', 'Sunstone Advisor')
+            pitch_key, pitch_text = rendered
+        elif nurture_info:
             category = nurture_info.get('category', 'low')
             category_info = _get_brand_category_info(category)
             
             if category_info:
+                # Category without a template of its own
                 caller_name = nurture_info.get('caller_name', 'Sunstone Advisor')
-                location = city if city else state
-                # For nurture fallback, we need to handle the case where city might be empty
-                if category == 'low' and not city:
-                    # Use state instead of city for low category when no city
-                    pitch_text = f"Hi, I'm calling from Sunstone in {state}. I noticed you're interested in {course}. Would you like to know more about our programs?"
-                else:
-                    template = category_info.get('template', 'Hi, I\'m calling from Sunstone in {location}. I noticed you\'re interested in {course}. Would you like to know more about our programs?')
-                    pitch_text = template.format(location=location, course=course)
+                pitch_text = NURTURE_PITCH_TEMPLATE.format(location=location, course=course)
             else:
                 caller_name = nurture_info.get('caller_name', 'Sunstone Advisor')
-                location = city if city else state
                 pitch_text = f"Hi, I'm calling from Sunstone about educational opportunities in {location}. Are you interested in pursuing {course}?"
         else:
             # Ultimate fallback
             caller_name = 'Sunstone Advisor'
-            location = city if city else state
             pitch_text = f"Hi, I'm calling from Sunstone about educational opportunities in {location}. Are you interested in pursuing {course}?"
     
     return {
         'caller_name': caller_name,
-        'pitch_text': pitch_text
+        'pitch_text': pitch_text,
+        'pitch_key': pitch_key
     }
 
 
@@ -257,17 +732,18 @@ def enrich_lead(lead: Dict[str, str]) -> Dict[str, Any]:
     
     # Get language from lead or derive from state
     language = lead.get('language', '')
-    if not language and lead.get('state') in STATE_LANGUAGE_MAP:
+    state_language_map = current_dataset().state_language_map
+    if not language and lead.get('state') in state_language_map:
         # Get the first (primary) language from the array
-        state_languages = STATE_LANGUAGE_MAP[lead['state']]
+        state_languages = state_language_map[lead['state']]
         language = state_languages[0] if state_languages else 'English'
     
-    # Build pitch
-    pitch_data = build_pitch(lead)
-    
     # Choose TTS languages
     tts_languages = choose_tts_languages(language)
     
+    # Build pitch in the primary TTS language
+    pitch_data = build_pitch(lead, tts_languages[0])
+    
     # Return enriched lead
     enriched_lead = lead.copy()
     enriched_lead.update(pitch_data)
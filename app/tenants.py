@@ -0,0 +1,181 @@
+"""
+Tenant-aware registry of intelligence datasets.
+
+Each partner brand keeps its own data files under TENANT_DATA_DIR/<tenant_id>/.
+Any file a tenant does not provide is inherited from the default dataset.
+Datasets are loaded on first use and kept in a memory-bounded LRU. Each
+tenant is charged for its own data and indexes plus the worst-case size of
+its caches.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .runtime import DEFAULT_DATASET, IntelDataset
+
+TENANT_DATA_DIR = os.environ.get(
+    'TENANT_DATA_DIR', str(Path(__file__).resolve().parent / 'dist' / 'tenants')
+)
+TENANT_CACHE_MAX_MB = float(os.environ.get('TENANT_CACHE_MAX_MB', '256'))
+TENANT_IDLE_SECONDS = float(os.environ.get('TENANT_IDLE_SECONDS', '1800'))
+
+# Longest gap between idle sweeps while requests are being served
+IDLE_SWEEP_SECONDS = 60.0
+
+_TENANT_ID_RE = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+class UnknownTenantError(KeyError):
+    """Raised when a tenant has no data directory."""
+
+
+class _TenantEntry:
+    """A loaded tenant dataset and its bookkeeping."""
+
+    def __init__(self, dataset: IntelDataset):
+        self.dataset = dataset
+        self.loaded_at = time.time()
+        self.last_used = time.monotonic()
+        self.hits = 0
+
+
+class TenantRegistry:
+    """
+    Lazily loads tenant datasets and evicts the least recently used ones
+    once the combined size exceeds `max_bytes` or a tenant sits idle for
+    longer than `idle_seconds`.
+    """
+
+    def __init__(self, data_dir: str = TENANT_DATA_DIR,
+                 max_bytes: int = int(TENANT_CACHE_MAX_MB * 1024 * 1024),
+                 idle_seconds: float = TENANT_IDLE_SECONDS,
+                 base: IntelDataset = DEFAULT_DATASET):
+        self.data_dir = Path(data_dir)
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self.base = base
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, _TenantEntry]' = OrderedDict()
+        # Loads in progress; other requests for the same tenant wait on these
+        self._loading: Dict[str, 'Future[IntelDataset]'] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def get(self, tenant_id: Optional[str]) -> IntelDataset:
+        """
+        Return the dataset for `tenant_id`, loading it if needed.
+        An empty tenant id selects the default dataset. Every call, whichever
+        dataset it selects, may sweep out idle tenants.
+        """
+        self._sweep()
+        if not tenant_id:
+            return self.base
+        if not _TENANT_ID_RE.match(tenant_id):
+            raise UnknownTenantError(tenant_id)
+
+        with self._lock:
+            self._evict_idle()
+
+            entry = self._entries.get(tenant_id)
+            if entry is not None:
+                return self._touch(tenant_id, entry)
+
+            pending = self._loading.get(tenant_id)
+            owner = pending is None
+            if owner:
+                pending = self._loading[tenant_id] = Future()
+
+        # Only the first request loads; the lock stays free for other tenants
+        if owner:
+            self._load(tenant_id, pending)
+        dataset = pending.result()
+
+        with self._lock:
+            entry = self._entries.get(tenant_id)
+            if entry is not None and entry.dataset is dataset:
+                self._touch(tenant_id, entry)
+        return dataset
+
+    def _load(self, tenant_id: str, pending: 'Future[IntelDataset]') -> None:
+        try:
+            root = self.data_dir / tenant_id
+            if not root.is_dir():
+                raise UnknownTenantError(tenant_id)
+            dataset = IntelDataset.load(name=tenant_id, root=root, base=self.base)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[tenant_id]
+            pending.set_exception(e)
+            return
+
+        with self._lock:
+            del self._loading[tenant_id]
+            self._entries[tenant_id] = _TenantEntry(dataset)
+            self._evict_oversize()
+        pending.set_result(dataset)
+
+    def _sweep(self) -> None:
+        # Unlocked check first so default-dataset requests stay lock-free
+        if time.monotonic() - self._last_sweep < min(self.idle_seconds, IDLE_SWEEP_SECONDS):
+            return
+        with self._lock:
+            self._last_sweep = time.monotonic()
+            self._evict_idle()
+
+    def _touch(self, tenant_id: str, entry: _TenantEntry) -> IntelDataset:
+        self._entries.move_to_end(tenant_id)
+        entry.last_used = time.monotonic()
+        entry.hits += 1
+        return entry.dataset
+
+    def evict(self, tenant_id: str) -> bool:
+        """Drop a tenant dataset; it is reloaded on next use."""
+        with self._lock:
+            return self._entries.pop(tenant_id, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-tenant load time and memory, plus registry totals."""
+        with self._lock:
+            self._evict_idle()
+            now = time.monotonic()
+            tenants: List[Dict[str, Any]] = [
+                {
+                    'tenant_id': tenant_id,
+                    'load_ms': round(entry.dataset.load_seconds * 1000, 3),
+                    'size_bytes': entry.dataset.size_bytes,
+                    'cache_bytes': entry.dataset.cache_bytes,
+                    'loaded_at': entry.loaded_at,
+                    'idle_seconds': round(now - entry.last_used, 3),
+                    'hits': entry.hits,
+                }
+                for tenant_id, entry in self._entries.items()
+            ]
+            return {
+                'tenants': tenants,
+                'total_bytes': self._total_bytes(),
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+            }
+
+    def _total_bytes(self) -> int:
+        return sum(entry.dataset.size_bytes + entry.dataset.cache_bytes for entry in self._entries.values())
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_seconds
+        for tenant_id in [t for t, e in self._entries.items() if e.last_used < cutoff]:
+            del self._entries[tenant_id]
+            self.evictions += 1
+
+    def _evict_oversize(self) -> None:
+        # Always keep the most recently loaded tenant, even if it alone is over budget
+        while len(self._entries) > 1 and self._total_bytes() > self.max_bytes:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+TENANTS = TenantRegistry()
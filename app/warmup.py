@@ -0,0 +1,116 @@
+"""
+Startup warm-up and readiness tracking.
+
+Warm-up verifies the default dataset and runs representative leads through
+every enrich_lead branch so indexes and pitch caches are hot before the
+load balancer sends real traffic.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .runtime import DEFAULT_DATASET, IntelDataset, enrich_lead, use_dataset
+
+# Data that must be present for the service to produce real pitches
+REQUIRED_DATA = ('state_language_map', 'campus_coverage', 'brand_registry', 'bot_language_support')
+
+WARMUP_COURSE = 'BBA'
+
+
+class Readiness:
+    """Thread-safe warm-up status shared with the /ready endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.status = 'starting'
+        self.errors: List[str] = []
+        self.details: Dict[str, Any] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.status == 'ready'
+
+    def update(self, status: str, errors: Optional[List[str]] = None, **details: Any) -> None:
+        with self._lock:
+            self.status = status
+            if errors is not None:
+                self.errors = errors
+            self.details.update(details)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'status': self.status, 'errors': list(self.errors), **self.details}
+
+
+READINESS = Readiness()
+
+
+def verify_dataset(dataset: IntelDataset) -> List[str]:
+    """Return a list of problems that would leave the dataset serving only fallbacks."""
+    errors = [f"{attr} is empty" for attr in REQUIRED_DATA if not getattr(dataset, attr)]
+    if dataset.brand_registry and not dataset.pitch_template_index:
+        errors.append("no pitch templates could be built from brand_registry")
+    return errors
+
+
+def representative_leads(dataset: IntelDataset) -> List[Dict[str, str]]:
+    """One lead per enrich_lead branch, built from the dataset itself."""
+    colleges = [code for code in dataset.brand_registry.get('colleges', {}) if code != 'nurture']
+    campus = dataset.campus_coverage[0] if dataset.campus_coverage else {}
+    state = campus.get('state') or next(iter(dataset.state_language_map), 'Maharashtra')
+    city = campus.get('city', '')
+
+    leads = [
+        # Case A: known college
+        {'college': colleges[0] if colleges else '', 'city': city, 'state': state},
+        # Case A: unknown college
+        {'college': 'Warmup College', 'city': city, 'state': state},
+        # Case B: city with coordinates
+        {'college': '', 'city': city, 'state': state},
+        # Case B: city not in coverage, state fallback
+        {'college': '', 'city': 'Warmup City', 'state': state},
+        # Case C: nurture fallback
+        {'college': '', 'city': '', 'state': state},
+    ]
+
+    # Every TTS language that has localized pitches, plus state-derived language
+    languages = [''] + sorted(dataset.localized_pitch_templates) + ['English']
+    return [
+        dict(lead, course=WARMUP_COURSE, language=language)
+        for lead in leads
+        for language in languages
+    ]
+
+
+def run_warmup(dataset: IntelDataset = DEFAULT_DATASET, readiness: Readiness = READINESS) -> None:
+    """Verify data and exercise every code path, then mark the worker ready."""
+    started = time.perf_counter()
+    readiness.update('warming_up', dataset=dataset.name)
+    try:
+        errors = verify_dataset(dataset)
+        if errors:
+            readiness.update('failed', errors=errors)
+            return
+
+        leads = representative_leads(dataset)
+        with use_dataset(dataset):
+            for lead in leads:
+                enrich_lead(lead)
+
+        readiness.update(
+            'ready',
+            errors=[],
+            warmup_ms=round((time.perf_counter() - started) * 1000, 3),
+            warmup_leads=len(leads),
+            data_load_ms=round(dataset.load_seconds * 1000, 3),
+            artifact=dataset.artifact is not None,
+        )
+    except Exception as e:
+        readiness.update('failed', errors=[f"warm-up failed: {e}"])
+
+
+def start_warmup(dataset: IntelDataset = DEFAULT_DATASET, readiness: Readiness = READINESS) -> threading.Thread:
+    """Run warm-up in the background so liveness checks answer immediately."""
+    thread = threading.Thread(target=run_warmup, args=(dataset, readiness), name='warmup', daemon=True)
+    thread.start()
+    return thread
@@ -3,7 +3,10 @@ Tests for the Lead Intelligence API.
 """
 import pytest
 from fastapi.testclient import TestClient
+from app import main
 from app.main import app
+from app.runtime import IntelDataset
+from app.warmup import Readiness, run_warmup
 
 client = TestClient(app)
 
@@ -15,6 +18,55 @@ def test_health_check():
     assert response.json() == {"status": "healthy", "service": "lead-intel-api"}
 
 
+def test_readiness_not_ready_before_warmup(monkeypatch):
+    """Test readiness endpoint answers 503 until warm-up has finished."""
+    readiness = Readiness()
+    monkeypatch.setattr(main, "READINESS", readiness)
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+    readiness.update("warming_up")
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming_up"
+
+
+def test_readiness_failed_with_empty_dataset(monkeypatch):
+    """Test readiness endpoint reports the data errors when nothing loaded."""
+    readiness = Readiness()
+    monkeypatch.setattr(main, "READINESS", readiness)
+    run_warmup(IntelDataset(name="empty"), readiness)
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "failed"
+    assert "brand_registry is empty" in response.json()["errors"]
+
+
+def test_readiness_ready_after_warmup(monkeypatch):
+    """Test readiness endpoint answers 200 once warm-up succeeds."""
+    dataset = IntelDataset(
+        name="warm",
+        state_language_map={"Goa": ["Konkani"]},
+        campus_coverage=[{"city": "Panaji", "state": "Goa", "brand": "GU", "latitude": 15.49, "longitude": 73.82}],
+        brand_registry={
+            "colleges": {"GU": {"name": "Goa University", "short": "GU", "category": "high", "caller_name": "Asha"}},
+            "brand_categories": {"high": {"template": "Hi, I'm calling from {college_name} about {course}."}}
+        },
+        bot_language_support={"Konkani": {"enabled": 0, "fallback_to": "English"}},
+    )
+    readiness = Readiness()
+    monkeypatch.setattr(main, "READINESS", readiness)
+    run_warmup(dataset, readiness)
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response.json()["errors"] == []
+
+
 def test_root_endpoint():
     """Test root endpoint."""
     response = client.get("/")
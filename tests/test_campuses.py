@@ -0,0 +1,133 @@
+"""
+Tests for campus search.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from app import main
+from app.campus_index import CampusIndex, haversine_km
+from app.runtime import IntelDataset
+from app.tenants import TenantRegistry
+
+
+CAMPUSES = [
+    {"city": "Pune", "state": "Maharashtra", "brand": "ADYPU", "latitude": 18.5204, "longitude": 73.8567},
+    {"city": "Pune", "state": "Maharashtra", "brand": "MIT", "latitude": 18.4575, "longitude": 73.8508},
+    {"city": "Mumbai", "state": "Maharashtra", "brand": "ADYPU", "latitude": 19.0760, "longitude": 72.8777},
+    {"city": "Indore", "state": "Madhya Pradesh", "brand": "SAGE", "latitude": 22.7196, "longitude": 75.8577},
+    {"city": "Bhopal", "state": "Madhya Pradesh", "brand": "SAGE", "latitude": 23.2599, "longitude": 77.4126},
+    {"city": "Nowhere", "state": "Goa", "brand": "SAGE"},
+]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    dataset = IntelDataset(name="campuses", campus_coverage=CAMPUSES)
+    monkeypatch.setattr(main, "TENANTS", TenantRegistry(data_dir=str(tmp_path), base=dataset))
+    return TestClient(main.app)
+
+
+def test_index_matches_brute_force():
+    """Test radius and k-nearest queries agree with a full scan."""
+    index = CampusIndex(CAMPUSES)
+    brute = sorted(
+        (haversine_km(18.52, 73.85, c["latitude"], c["longitude"]), i)
+        for i, c in enumerate(CAMPUSES) if "latitude" in c
+    )
+
+    assert len(index) == 5
+    assert index.query(18.52, 73.85, k=3) == brute[:3]
+    assert index.query(18.52, 73.85, radius_km=200) == [m for m in brute if m[0] <= 200]
+    assert [p for _, p in index.query(18.52, 73.85, k=2, campus_coverage=CAMPUSES, brand="SAGE")] == [3, 4]
+
+
+def test_nearby_by_point_with_radius(client):
+    """Test radius search around a point, closest first."""
+    response = client.get("/campuses/nearby", params={"lat": 18.52, "lon": 73.85, "radius_km": 200})
+    assert response.status_code == 200
+
+    data = response.json()
+    assert [c["city"] for c in data["campuses"]] == ["Pune", "Pune", "Mumbai"]
+    assert data["next_cursor"] is None
+
+
+def test_nearby_by_city_with_filters(client):
+    """Test k-nearest search around a city with a brand filter."""
+    response = client.get("/campuses/nearby", params={"city": "pune", "state": "Maharashtra", "k": 5, "brand": "ADYPU"})
+    assert response.status_code == 200
+    assert [c["city"] for c in response.json()["campuses"]] == ["Pune", "Mumbai"]
+
+    assert client.get("/campuses/nearby", params={"city": "Atlantis"}).status_code == 404
+    assert client.get("/campuses/nearby").status_code == 422
+
+
+def test_nearby_cursor_pagination(client):
+    """Test cursors walk through every result exactly once."""
+    params = {"lat": 20.0, "lon": 75.0, "k": 5, "limit": 2}
+    first_cursor = client.get("/campuses/nearby", params=params).json()["next_cursor"]
+    seen = []
+    cursor = None
+    while True:
+        data = client.get("/campuses/nearby", params=dict(params, cursor=cursor) if cursor else params).json()
+        seen += [c["brand"] + c["city"] for c in data["campuses"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 5 == len(set(seen))
+    # A cursor only continues the query it came from
+    other_query = dict(params, k=4, cursor=first_cursor)
+    assert client.get("/campuses/nearby", params=other_query).status_code == 422
+    assert client.get("/campuses/nearby", params=dict(params, cursor="not-a-cursor")).status_code == 422
+
+
+def test_radius_pages_only_walk_to_the_page(client, monkeypatch):
+    """Test wide radius pages ask the index for no more than the page plus one."""
+    asked = []
+    real_query = CampusIndex.query
+
+    def counting_query(self, *args, **kwargs):
+        asked.append(kwargs.get("k"))
+        return real_query(self, *args, **kwargs)
+
+    monkeypatch.setattr(CampusIndex, "query", counting_query)
+    params = {"lat": 20.0, "lon": 75.0, "radius_km": 2000, "limit": 2}
+    seen = []
+    cursor = None
+    while True:
+        data = client.get("/campuses/nearby", params=dict(params, cursor=cursor) if cursor else params).json()
+        seen += [c["brand"] + c["city"] for c in data["campuses"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 5 == len(set(seen))
+    assert asked == [3, 5, 7]
+
+
+def test_index_exact_near_poles_and_antimeridian():
+    """Test queries stay exact at the poles and across +/-180 longitude."""
+    campuses = [
+        {"latitude": 0.0, "longitude": 179.9},
+        {"latitude": 0.0, "longitude": -179.95},
+        {"latitude": 0.1, "longitude": 180.0},
+        {"latitude": -89.5, "longitude": 10.0},
+        {"latitude": 20.0, "longitude": 78.0},
+    ]
+    index = CampusIndex(campuses)
+
+    def brute(lat, lon):
+        return sorted((haversine_km(lat, lon, c["latitude"], c["longitude"]), i) for i, c in enumerate(campuses))
+
+    assert [p for _, p in index.query(0.0, -179.9, radius_km=50)] == [1, 2, 0]
+    for lat, lon in [(-89.0, -179.0), (-60.0, 0.0), (90.0, 0.0), (0.0, 180.0)]:
+        assert index.query(lat, lon, k=3) == brute(lat, lon)[:3]
+
+
+def test_nearby_by_city_uses_city_state_index(client, monkeypatch):
+    """Test city lookups go through the (city, state) index, not a state scan."""
+    dataset = main.TENANTS.base
+    assert dataset.campus_city_state_index[("pune", "Maharashtra")] == (18.5204, 73.8567)
+    monkeypatch.setattr(dataset, "campuses_by_state", {})
+
+    response = client.get("/campuses/nearby", params={"city": "Pune", "state": "Maharashtra", "k": 1})
+    assert response.json()["campuses"][0]["city"] == "Pune"
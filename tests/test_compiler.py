@@ -0,0 +1,137 @@
+"""
+Tests for the intelligence data compiler.
+"""
+import gzip
+import json
+import pytest
+from app import compiler
+from app import runtime
+from app.runtime import ARTIFACT_FILE, ARTIFACT_FORMAT_VERSION, IntelDataset, read_artifact
+
+
+SOURCES = {
+    "state_language_map.json": {"Maharashtra": ["Marathi", "Hindi"]},
+    "brand_registry.json": {
+        "colleges": {"ADYPU": {"name": "Ajeenkya DY Patil University", "short": "ADYPU", "category": "high", "caller_name": "Rahul Kumar"}},
+        "brand_categories": {"high": {"template": "Hi, I'm calling from {college_name} about {course}."}}
+    },
+    "bot_language_support.json": {"Marathi": {"enabled": 0, "fallback_to": "Hindi"}, "Hindi": {"enabled": 1}},
+    "localized_pitch_templates.json": {"Hindi": {"high": "नमस्ते, मैं {college_name} से {course} के बारे में बात कर रहा हूँ।"}},
+}
+CAMPUSES = [
+    {"city": "Pune", "state": "Maharashtra", "brand": "ADYPU", "latitude": 18.52, "longitude": 73.85},
+    {"city": "Mumbai", "state": "Maharashtra", "brand": "ADYPU", "latitude": 19.07, "longitude": 72.87},
+]
+
+
+def _write_sources(root, campuses=CAMPUSES, overrides=None):
+    for filename, content in dict(SOURCES, **(overrides or {})).items():
+        (root / filename).write_text(json.dumps(content, ensure_ascii=False))
+    (root / "campus_coverage.json.gz").write_bytes(gzip.compress(json.dumps(campuses).encode()))
+
+
+def test_compile_and_load_artifact(tmp_path):
+    """Test a clean source directory compiles to a loadable artifact."""
+    _write_sources(tmp_path)
+    assert compiler.main(["--source", str(tmp_path)]) == 0
+
+    dataset = IntelDataset.load(name="compiled", root=tmp_path)
+    assert dataset.artifact["format_version"] == ARTIFACT_FORMAT_VERSION
+    assert dataset.artifact["counts"]["campuses"] == 2
+    assert dataset.campus_city_index["pune"] == (18.52, 73.85)
+    assert [c["city"] for c in dataset.campuses_by_state["Maharashtra"]] == ["Pune", "Mumbai"]
+    assert dataset.pitch_template_index[("ADYPU", "Hindi")][0] == "high"
+
+
+def test_artifact_loads_without_rebuilding_indexes(tmp_path, monkeypatch):
+    """Test every campus index comes prebuilt from the artifact."""
+    _write_sources(tmp_path)
+    compiler.main(["--source", str(tmp_path)])
+
+    def not_rebuilt(*args, **kwargs):
+        raise AssertionError("index rebuilt at load")
+
+    monkeypatch.setattr(runtime, "_build_campus_indexes", not_rebuilt)
+    monkeypatch.setattr(runtime.CampusIndex, "_cell", not_rebuilt)
+    dataset = IntelDataset.load(name="compiled", root=tmp_path)
+    monkeypatch.undo()
+
+    assert dataset.artifact is not None
+    assert dataset.campus_city_state_index[("mumbai", "Maharashtra")] == (19.07, 72.87)
+    assert dataset.default_brand_by_state == {"Maharashtra": "ADYPU"}
+    assert [p for _, p in dataset.campus_index.query(19.0, 72.9, k=1)] == [1]
+
+
+def test_artifact_checksum_verified(tmp_path):
+    """Test a corrupted artifact is rejected."""
+    _write_sources(tmp_path)
+    compiler.main(["--source", str(tmp_path)])
+    data = bytearray((tmp_path / ARTIFACT_FILE).read_bytes())
+    data[-5] ^= 0xFF
+
+    with pytest.raises(ValueError, match="checksum"):
+        read_artifact(bytes(data))
+
+
+def test_stale_artifact_not_served(tmp_path, capsys):
+    """Test raw files edited after compiling are loaded instead of the artifact."""
+    _write_sources(tmp_path)
+    compiler.main(["--source", str(tmp_path)])
+    registry = dict(SOURCES["brand_registry.json"])
+    registry["colleges"] = {"ADYPU": dict(registry["colleges"]["ADYPU"], caller_name="Neha Joshi")}
+    (tmp_path / "brand_registry.json").write_text(json.dumps(registry))
+
+    dataset = IntelDataset.load(name="edited", root=tmp_path)
+
+    assert dataset.artifact is None
+    assert dataset.brand_registry["colleges"]["ADYPU"]["caller_name"] == "Neha Joshi"
+    assert "brand_registry.json changed since it was compiled" in capsys.readouterr().out
+
+
+def test_validation_errors_block_compile(tmp_path):
+    """Test invalid coordinates, references, placeholders and cycles are reported."""
+    _write_sources(
+        tmp_path,
+        campuses=[{"city": "Pune", "state": "Maharashtra", "brand": "XYZ", "latitude": 118.5, "longitude": 73.8}],
+        overrides={
+            "bot_language_support.json": {"Marathi": {"enabled": 0, "fallback_to": "Konkani"}, "Konkani": {"enabled": 0, "fallback_to": "Marathi"}},
+            "localized_pitch_templates.json": {"Hindi": {"high": "नमस्ते {college}", "premium": "{course}"}},
+        },
+    )
+    data, _, _ = compiler.read_sources(tmp_path)
+    errors, _ = compiler.validate(data)
+    text = "\n".join(errors)
+
+    assert "brand 'XYZ'" in text
+    assert "out of range" in text
+    assert "unknown placeholder {college}" in text
+    assert "unknown category 'premium'" in text
+    assert "fallback cycle Marathi -> Konkani -> Marathi" in text
+    assert compiler.main(["--source", str(tmp_path)]) == 1
+    assert not (tmp_path / ARTIFACT_FILE).exists()
+
+
+@pytest.mark.parametrize("overrides, expected", [
+    ({"brand_registry.json": {"colleges": [], "brand_categories": {}}}, "colleges must be an object"),
+    ({"brand_registry.json": {"colleges": {"A": "x"}, "brand_categories": {}}}, "colleges.A: must be an object"),
+    ({"brand_registry.json": {"colleges": {}, "brand_categories": {"high": "x"}}}, "brand_categories.high: must be an object"),
+    ({"localized_pitch_templates.json": {"Hindi": "oops"}}, "Hindi: must be an object of category templates"),
+    ({"bot_language_support.json": {"Hindi": "on"}}, "Hindi: must be an object"),
+    ({"bot_language_support.json": {"Hindi": {"enabled": 0, "fallback_to": ["English"]}}}, "fallback_to must be a language name"),
+])
+def test_malformed_shapes_reported_not_raised(tmp_path, capsys, overrides, expected):
+    """Test malformed files produce error lines instead of tracebacks."""
+    _write_sources(tmp_path, campuses=[], overrides=overrides)
+
+    assert compiler.main(["--source", str(tmp_path)]) == 1
+    assert expected in capsys.readouterr().err
+    assert not (tmp_path / ARTIFACT_FILE).exists()
+
+
+def test_malformed_registry_does_not_break_loading(tmp_path):
+    """Test the service still loads when a category is not an object."""
+    _write_sources(tmp_path, overrides={"brand_registry.json": {"colleges": {"A": {"category": "high"}}, "brand_categories": {"high": "x"}}})
+
+    dataset = IntelDataset.load(name="raw", root=tmp_path)
+    assert ("A", "English") not in dataset.pitch_template_index
+    assert ("A", "Hindi") in dataset.pitch_template_index
@@ -0,0 +1,126 @@
+"""
+Tests for queued JSON logging.
+"""
+import io
+import json
+import logging
+import queue
+from app.logging_setup import BatchWriter, JsonFormatter, NonBlockingQueueHandler
+
+
+def _logger_with_queue(maxsize=0):
+    log_queue = queue.Queue(maxsize=maxsize)
+    handler = NonBlockingQueueHandler(log_queue)
+    logger = logging.getLogger(f"test-json-{id(log_queue)}")
+    logger.propagate = False
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    return logger, handler, log_queue
+
+
+def test_records_written_as_json_batches():
+    """Test queued records are formatted off-thread as JSON lines."""
+    logger, _, log_queue = _logger_with_queue()
+    stream = io.StringIO()
+    writer = BatchWriter(log_queue, stream, JsonFormatter(), batch_size=10, flush_interval=0.05)
+    writer.start()
+
+    logger.info("Successfully enriched lead for state: %s", "Goa", extra={"event": "lead_enriched", "state": "Goa"})
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError as e:
+        logger.error("Internal error: %s", e, exc_info=True)
+    writer.stop()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[0]["message"] == "Successfully enriched lead for state: Goa"
+    assert lines[0]["event"] == "lead_enriched"
+    assert lines[0]["state"] == "Goa"
+    assert lines[1]["level"] == "ERROR"
+    assert "RuntimeError: boom" in lines[1]["exc_info"]
+
+
+def test_queue_handler_does_not_format_or_block():
+    """Test records are enqueued unformatted and dropped when the queue is full."""
+    logger, handler, log_queue = _logger_with_queue(maxsize=1)
+
+    class Explosive:
+        def __str__(self):
+            raise AssertionError("formatted on the request path")
+
+    logger.info("lazy %s", Explosive())
+    logger.info("dropped")
+
+    assert log_queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_errors_written_synchronously_when_queue_full():
+    """Test warnings and errors bypass a full queue instead of being dropped."""
+    stream = io.StringIO()
+    fallback = logging.StreamHandler(stream)
+    fallback.setFormatter(JsonFormatter())
+    log_queue = queue.Queue(maxsize=1)
+    handler = NonBlockingQueueHandler(log_queue, fallback=fallback)
+    logger = logging.getLogger(f"test-json-fallback-{id(log_queue)}")
+    logger.propagate = False
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+    logger.info("queued")
+    logger.info("dropped")
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError as e:
+        logger.error("Internal error: %s", e, exc_info=True)
+
+    assert log_queue.qsize() == 1
+    assert handler.dropped == 1
+    line = json.loads(stream.getvalue())
+    assert line["level"] == "ERROR"
+    assert line["message"] == "Internal error: boom"
+    assert "RuntimeError: boom" in line["exc_info"]
+
+
+def test_dropped_records_reported():
+    """Test the writer reports dropped records once per interval and on stop."""
+    logger, handler, log_queue = _logger_with_queue(maxsize=1)
+    logger.info("queued")
+    logger.info("dropped")
+    logger.info("dropped")
+
+    stream = io.StringIO()
+    writer = BatchWriter(log_queue, stream, JsonFormatter(), batch_size=10, flush_interval=0.05,
+                         handler=handler, report_interval=3600)
+    writer.start()
+    writer.stop()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[0]["message"] == "queued"
+    assert lines[1]["event"] == "log_records_dropped"
+    assert lines[1]["level"] == "WARNING"
+    assert lines[1]["dropped"] == 2
+    assert lines[1]["dropped_total"] == 2
+    assert writer.reported == 2
+
+
+def test_concurrent_drops_all_counted():
+    """Test drops from many threads at once are all counted."""
+    import threading
+
+    log_queue = queue.Queue(maxsize=1)
+    log_queue.put_nowait(None)
+    handler = NonBlockingQueueHandler(log_queue)
+    record = logging.LogRecord("test", logging.INFO, __file__, 0, "dropped", None, None)
+
+    def drop_many():
+        for _ in range(2000):
+            handler.enqueue(record)
+
+    threads = [threading.Thread(target=drop_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert handler.dropped == 16000
@@ -0,0 +1,187 @@
+"""
+Tests for the runtime helpers of the Lead Intelligence API.
+"""
+import pytest
+from app import runtime
+
+
+SAMPLE_BRAND_REGISTRY = {
+    "colleges": {
+        "ADYPU": {"name": "Ajeenkya DY Patil University", "short": "ADYPU", "category": "high", "caller_name": "Rahul Kumar"},
+        "SAGE": {"name": "SAGE University", "short": "SAGE", "category": "medium", "caller_name": "Priya Sharma"},
+        "nurture": {"name": "Sunstone", "short": "Sunstone", "category": "low", "caller_name": "Sunstone Advisor"}
+    },
+    "brand_categories": {
+        "high": {"template": "Hi, I'm calling from {college_name} about {course}."},
+        "medium": {"template": "Hi, I'm calling from {college_short} in {city} about {course}."},
+        "low": {"template": "Hi, I'm calling from Sunstone in {city} about {course}."}
+    }
+}
+
+SAMPLE_BOT_LANGUAGE_SUPPORT = {
+    "Hindi": {"enabled": 1},
+    "Marathi": {"enabled": 0, "fallback_to": "Hindi"},
+    "English": {"enabled": 1}
+}
+
+
+@pytest.fixture
+def sample_data():
+    """Serve a small, known intelligence dataset."""
+    dataset = runtime.IntelDataset(
+        name="sample",
+        brand_registry=SAMPLE_BRAND_REGISTRY,
+        bot_language_support=SAMPLE_BOT_LANGUAGE_SUPPORT,
+        localized_pitch_templates=runtime.DEFAULT_DATASET.localized_pitch_templates,
+    )
+    with runtime.use_dataset(dataset):
+        yield dataset
+
+
+def test_pitch_rendered_in_primary_tts_language(sample_data):
+    """Test pitch text follows the first TTS language."""
+    lead = {"college": "ADYPU", "city": "Pune", "state": "Maharashtra", "course": "BBA", "language": "Hindi"}
+    enriched = runtime.enrich_lead(lead)
+
+    assert enriched["tts_languages"] == ["Hindi", "English"]
+    assert "Ajeenkya DY Patil University" in enriched["pitch_text"]
+    assert "BBA" in enriched["pitch_text"]
+    assert "calling" not in enriched["pitch_text"]
+    assert enriched["pitch_key"].startswith("ADYPU:Hindi:")
+
+
+def test_pitch_falls_back_to_english_template(sample_data):
+    """Test English pitch is used when no localized template exists."""
+    lead = {"college": "SAGE", "city": "Indore", "state": "Madhya Pradesh", "course": "MBA", "language": "English"}
+    enriched = runtime.enrich_lead(lead)
+
+    assert enriched["pitch_text"] == "Hi, I'm calling from SAGE in Indore about MBA."
+    assert enriched["pitch_key"].startswith("SAGE:English:")
+
+
+def test_pitch_cache_key_is_stable(sample_data):
+    """Test cache keys ignore unused fields but track everything rendered."""
+    key = runtime.pitch_cache_key("ADYPU", "BBA", "Hindi", "Pune")
+
+    assert key == runtime.pitch_cache_key("ADYPU", "BBA", "Hindi", "Mumbai")
+    assert key != runtime.pitch_cache_key("ADYPU", "MBA", "Hindi", "Pune")
+    assert runtime.pitch_cache_key("SAGE", "BBA", "Hindi", "Indore") != runtime.pitch_cache_key("SAGE", "BBA", "Hindi", "Bhopal")
+    assert runtime.pitch_cache_key("UNKNOWN", "BBA", "Hindi") is None
+
+
+def test_pitch_key_matches_rendered_text(sample_data):
+    """Test leads differing only in case get their own text and key."""
+    lower_key, lower_text = runtime.render_pitch("SAGE", "mba", "English", "indore")
+    upper_key, upper_text = runtime.render_pitch("SAGE", "MBA", "English", "Indore")
+
+    assert lower_text == "Hi, I'm calling from SAGE in indore about mba."
+    assert upper_text == "Hi, I'm calling from SAGE in Indore about MBA."
+    assert lower_key != upper_key
+
+
+def test_english_nurture_pitch_has_key(sample_data):
+    """Test the English nurture fallback keeps its wording and goes through the keyed render path."""
+    lead = {"college": "", "city": "", "state": "Goa", "course": "BBA", "language": "English"}
+    enriched = runtime.enrich_lead(lead)
+
+    assert enriched["pitch_text"] == (
+        "Hi, I'm calling from Sunstone in Goa. I noticed you're interested in BBA. "
+        "Would you like to know more about our programs?"
+    )
+    assert enriched["pitch_key"].startswith("nurture:English:")
+
+
+def test_localized_nurture_pitch_uses_category_template():
+    """Test non-English nurture pitches render the localized category template."""
+    dataset = runtime.IntelDataset(
+        name="sample",
+        brand_registry=SAMPLE_BRAND_REGISTRY,
+        bot_language_support=SAMPLE_BOT_LANGUAGE_SUPPORT,
+        localized_pitch_templates={"Hindi": {"low": "Namaste, Sunstone {city} se, {course} ke baare mein."}},
+    )
+    with runtime.use_dataset(dataset):
+        enriched = runtime.enrich_lead({"college": "", "city": "", "state": "Goa", "course": "BBA", "language": "Hindi"})
+
+    assert enriched["pitch_text"] == "Namaste, Sunstone Goa se, BBA ke baare mein."
+    assert enriched["pitch_key"].startswith("nurture:Hindi:")
+
+
+def test_rendered_pitch_is_cached(sample_data):
+    """Test repeated renders are served from the pitch cache."""
+    first = runtime.render_pitch("SAGE", "BBA", "Hindi", "Indore")
+    second = runtime.render_pitch("SAGE", "BBA", "Hindi", "Indore")
+
+    assert first == second
+    assert first[0] in sample_data.pitch_cache
+
+
+def test_warmup_marks_ready_after_exercising_branches():
+    """Test warm-up runs every branch and fills the pitch cache."""
+    from app.warmup import Readiness, run_warmup
+
+    dataset = runtime.IntelDataset(
+        name="sample",
+        state_language_map={"Maharashtra": ["Marathi"]},
+        campus_coverage=[{"city": "Pune", "state": "Maharashtra", "brand": "SAGE", "latitude": 18.52, "longitude": 73.85}],
+        brand_registry=SAMPLE_BRAND_REGISTRY,
+        bot_language_support=SAMPLE_BOT_LANGUAGE_SUPPORT,
+        localized_pitch_templates=runtime.DEFAULT_DATASET.localized_pitch_templates,
+    )
+    readiness = Readiness()
+
+    run_warmup(dataset, readiness)
+
+    assert readiness.ready, readiness.snapshot()
+    assert readiness.snapshot()["warmup_leads"] > 0
+    assert dataset.pitch_cache
+
+
+def test_warmup_fails_on_missing_data():
+    """Test warm-up reports not-ready when data files did not load."""
+    from app.warmup import Readiness, run_warmup
+
+    readiness = Readiness()
+    run_warmup(runtime.IntelDataset(name="empty"), readiness)
+
+    assert not readiness.ready
+    assert "brand_registry is empty" in readiness.snapshot()["errors"]
+
+
+def test_unknown_city_uses_state_default_brand(monkeypatch):
+    """Test unknown cities skip the campus scan and are negatively cached."""
+    dataset = runtime.IntelDataset(
+        name="sample",
+        campus_coverage=[
+            {"city": "Indore", "state": "Madhya Pradesh", "brand": "SAGE", "latitude": 22.72, "longitude": 75.86},
+            {"city": "Pune", "state": "Maharashtra", "brand": "ADYPU", "latitude": 18.52, "longitude": 73.85},
+        ],
+        brand_registry=SAMPLE_BRAND_REGISTRY,
+    )
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("unknown city should not scan campuses")
+
+    monkeypatch.setattr(runtime, "_find_nearby_campuses", no_scan)
+    lead = {"college": "", "city": "Indor", "state": "Madhya Pradesh", "course": "MBA"}
+    with runtime.use_dataset(dataset):
+        first = runtime.build_pitch(lead)
+        second = runtime.build_pitch(lead)
+
+    assert first == second
+    assert first["caller_name"] == "Priya Sharma"
+    assert dataset.unresolved_cities[("indor", "Madhya Pradesh")] == "SAGE"
+
+
+def test_unresolved_city_cache_evicts_least_recently_used(monkeypatch):
+    """Test cache hits keep an unresolved city from being evicted first."""
+    monkeypatch.setattr(runtime, "UNRESOLVED_CITY_CACHE_SIZE", 2)
+    dataset = runtime.IntelDataset(
+        name="sample",
+        campus_coverage=[{"city": "Indore", "state": "Madhya Pradesh", "brand": "SAGE", "latitude": 22.72, "longitude": 75.86}],
+        brand_registry=SAMPLE_BRAND_REGISTRY,
+    )
+    with runtime.use_dataset(dataset):
+        for city in ("Indor", "Ujain", "Indor", "Dewas"):
+            runtime._resolve_city_brand(city, "Madhya Pradesh")
+
+    assert list(dataset.unresolved_cities) == [("indor", "Madhya Pradesh"), ("dewas", "Madhya Pradesh")]
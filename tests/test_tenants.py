@@ -0,0 +1,158 @@
+"""
+Tests for the tenant dataset registry.
+"""
+import json
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app import main
+from app.runtime import IntelDataset
+from app.tenants import TenantRegistry, UnknownTenantError
+
+
+def _write_tenant(root, tenant_id, caller_name):
+    tenant_dir = root / tenant_id
+    tenant_dir.mkdir()
+    registry = {
+        "colleges": {"ACME": {"name": "Acme University", "short": "Acme", "category": "high", "caller_name": caller_name}},
+        "brand_categories": {"high": {"template": "Hi, I'm calling from {college_name} about {course}."}}
+    }
+    (tenant_dir / "brand_registry.json").write_text(json.dumps(registry))
+
+
+@pytest.fixture
+def registry(tmp_path):
+    _write_tenant(tmp_path, "acme", "Asha")
+    _write_tenant(tmp_path, "globex", "Gopal")
+    return TenantRegistry(data_dir=str(tmp_path), base=IntelDataset(name="default"))
+
+
+def test_tenant_loaded_lazily_and_inherits_missing_files(registry):
+    """Test tenant data is loaded on first use with base files inherited."""
+    assert registry.stats()["tenants"] == []
+
+    dataset = registry.get("acme")
+    assert dataset.brand_registry["colleges"]["ACME"]["caller_name"] == "Asha"
+    assert dataset.state_language_map is registry.base.state_language_map
+    assert registry.get("acme") is dataset
+
+    stats = registry.stats()["tenants"]
+    assert [t["tenant_id"] for t in stats] == ["acme"]
+    assert stats[0]["size_bytes"] > 0
+    assert stats[0]["hits"] == 2
+
+
+def test_unknown_tenant_rejected(registry):
+    """Test missing and malformed tenant ids raise UnknownTenantError."""
+    with pytest.raises(UnknownTenantError):
+        registry.get("missing")
+    with pytest.raises(UnknownTenantError):
+        registry.get("../acme")
+    assert registry.get("") is registry.base
+
+
+def test_lru_eviction_over_memory_budget(registry):
+    """Test the least recently used tenant is evicted when over budget."""
+    registry.max_bytes = registry.get("acme").size_bytes + 1
+    registry.get("globex")
+
+    assert [t["tenant_id"] for t in registry.stats()["tenants"]] == ["globex"]
+    assert registry.evictions == 1
+
+
+def test_idle_tenant_evicted(registry):
+    """Test tenants idle for longer than idle_seconds are evicted."""
+    registry.get("acme")
+    registry.idle_seconds = 0.2
+    time.sleep(0.3)
+    registry.get("globex")
+
+    assert [t["tenant_id"] for t in registry.stats()["tenants"]] == ["globex"]
+
+
+def test_idle_tenant_evicted_without_tenant_traffic(registry):
+    """Test idle tenants are swept by default-dataset requests and by stats."""
+    registry.get("acme")
+    registry.get("globex")
+    registry.idle_seconds = 0.05
+    time.sleep(0.1)
+
+    assert registry.get("") is registry.base
+    assert registry.evictions == 2
+
+    registry.get("acme")
+    time.sleep(0.1)
+    assert registry.stats()["tenants"] == []
+
+
+def test_cache_reserve_charged_to_budget(registry):
+    """Test each tenant's worst-case cache size counts towards the memory budget."""
+    dataset = registry.get("acme")
+    stats = registry.stats()
+
+    assert dataset.cache_bytes > 0
+    assert stats["tenants"][0]["cache_bytes"] == dataset.cache_bytes
+    assert stats["total_bytes"] == dataset.size_bytes + dataset.cache_bytes
+
+
+def test_tenant_selected_by_header_or_path(registry, monkeypatch):
+    """Test the API routes leads to the tenant named by header or path."""
+    monkeypatch.setattr(main, "TENANTS", registry)
+    client = TestClient(main.app)
+    lead = {"college": "ACME", "city": "", "state": "Goa", "course": "BBA", "language": ""}
+
+    by_header = client.post("/enrich_lead", json=lead, headers={"X-Tenant-ID": "acme"})
+    by_path = client.post("/tenants/globex/enrich_lead", json=lead)
+
+    assert by_header.status_code == 200
+    assert by_header.json()["caller_name"] == "Asha"
+    assert by_path.json()["caller_name"] == "Gopal"
+    assert client.post("/tenants/missing/enrich_lead", json=lead).status_code == 404
+    assert len(client.get("/tenants").json()["tenants"]) == 2
+
+
+def test_inherited_data_is_shared_and_not_charged(tmp_path):
+    """Test tenants reuse the base's derived indexes and are only charged for their own data."""
+    campuses = [{"city": "Pune", "state": "Maharashtra", "brand": "ACME", "latitude": 18.52, "longitude": 73.85}] * 500
+    base = IntelDataset(name="default", campus_coverage=campuses)
+    _write_tenant(tmp_path, "acme", "Asha")
+    registry = TenantRegistry(data_dir=str(tmp_path), base=base)
+
+    dataset = registry.get("acme")
+
+    assert dataset.campus_index is base.campus_index
+    assert dataset.campuses_by_state is base.campuses_by_state
+    assert dataset.size_bytes < 10000
+
+
+def test_cold_load_does_not_block_other_tenants(registry, monkeypatch):
+    """Test a slow tenant load neither holds the registry lock nor runs twice."""
+    import threading
+    from app import tenants
+
+    started = threading.Event()
+    release = threading.Event()
+    loads = []
+    real_load = IntelDataset.load
+
+    def slow_load(name, root, base):
+        loads.append(name)
+        if name == "acme":
+            started.set()
+            release.wait(5)
+        return real_load(name=name, root=root, base=base)
+
+    monkeypatch.setattr(tenants.IntelDataset, "load", staticmethod(slow_load))
+    results = []
+    waiters = [threading.Thread(target=lambda: results.append(registry.get("acme"))) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    assert started.wait(5)
+
+    assert registry.get("globex").name == "globex"
+
+    release.set()
+    for thread in waiters:
+        thread.join(5)
+    assert loads.count("acme") == 1
+    assert len(results) == 3 and all(r is results[0] for r in results)